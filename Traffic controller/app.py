@@ -3,45 +3,77 @@ import plotly.express as px
 import numpy as np
 import pandas as pd
 
+from comparison import ComparisonJob
+
 st.set_page_config(page_title="Traffic Optimizer", layout="wide")
 
 st.title("🚦 Traffic Light Optimization Dashboard")
-st.write("Compare traffic delays **before** and **after** optimization using AI rules.")
-
-# Sample data – replace with actual simulation results
-x = np.arange(0, 10, 1)
-
-delay_before = np.random.randint(30, 60, size=10)
-delay_after = delay_before - np.random.randint(5, 20, size=10)
-
-df = pd.DataFrame({
-    "Time": x,
-    "Delay Before": delay_before,
-    "Delay After": delay_after
-})
-
-# Create beautiful Plotly chart
-fig = px.line(
-    df,
-    x="Time",
-    y=["Delay Before", "Delay After"],
-    title="Traffic Delay Before vs After Optimization",
-    markers=True,
-)
-
-# Make graph beautiful
-fig.update_layout(
-    template="plotly_dark",
-    title_font_size=28,
-    title_x=0.5,
-    legend_title_text="",
-    hovermode="x unified",
-    plot_bgcolor="#0e1117",
-    paper_bgcolor="#0e1117",
-    font=dict(size=14)
-)
-
-fig.update_traces(line=dict(width=4))
-fig.update_traces(fill='tozeroy')
-
-st.plotly_chart(fig, use_container_width=True)
+st.write("Compare traffic delays **before** and **after** optimization using the traffic simulator.")
+
+st.sidebar.header("Scenario")
+rate_ns = st.sidebar.number_input("NS car rate (cars/cycle)", 1, 60, 12)
+rate_ew = st.sidebar.number_input("EW car rate (cars/cycle)", 1, 60, 8)
+cycles = st.sidebar.number_input("Cycles", 5, 500, 20)
+seed = st.sidebar.number_input("Seed", 0, 10000, 42)
+replications = st.sidebar.select_slider("Replications", [100, 500, 1000, 2000, 5000, 10000], 2000)
+
+@st.cache_resource(max_entries=32)
+def comparison_job(rate_ns, rate_ew, cycles, seed, replications):
+    # One background job per scenario; finished jobs stay cached so reopening is instant
+    return ComparisonJob(rate_ns, rate_ew, cycles, seed, replications).start()
+
+job = comparison_job(rate_ns, rate_ew, cycles, seed, replications)
+polling = not job.done
+
+@st.fragment(run_every=0.5 if polling else None)
+def results():
+    means, completed, best = job.snapshot()
+    if polling and job.done:
+        # Rerun the page once so the fragment is rebuilt without run_every
+        st.rerun()
+    if job.error is not None:
+        st.error(f"Simulation failed: {job.error}")
+        # Drop the failed job from the cache so the next run of this scenario starts a new one
+        comparison_job.clear(rate_ns, rate_ew, cycles, seed, replications)
+        if st.button("Retry"):
+            st.rerun()
+        return
+    if means is None:
+        st.info("Optimizing green times...")
+        return
+
+    st.caption(f"Replications: {completed}/{job.replications} — optimized green times NS={best[0]}, EW={best[1]}"
+               + ("" if job.done else " (running)"))
+    df = pd.DataFrame({
+        "Time": np.arange(1, cycles + 1),
+        "Delay Before": means[0],
+        "Delay After": means[1],
+    })
+
+    # Create beautiful Plotly chart
+    fig = px.line(
+        df,
+        x="Time",
+        y=["Delay Before", "Delay After"],
+        title="Average Queue per Cycle: Before vs After Optimization",
+        markers=True,
+    )
+
+    # Make graph beautiful
+    fig.update_layout(
+        template="plotly_dark",
+        title_font_size=28,
+        title_x=0.5,
+        legend_title_text="",
+        hovermode="x unified",
+        plot_bgcolor="#0e1117",
+        paper_bgcolor="#0e1117",
+        font=dict(size=14)
+    )
+
+    fig.update_traces(line=dict(width=4))
+    fig.update_traces(fill='tozeroy')
+
+    st.plotly_chart(fig, use_container_width=True)
+
+results()
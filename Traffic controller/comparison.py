@@ -0,0 +1,65 @@
+"""
+Background baseline-vs-optimized comparison runs for the dashboard
+
+A ComparisonJob runs in a daemon thread: it picks the optimized green times
+with the successive-halving search, then simulates baseline (10, 10) and the
+optimized plan on the same arrival traces in chunks of replications. After
+each chunk the running per-cycle averages are published, so the UI can
+redraw partial results while the job keeps going.
+"""
+
+import threading
+
+import numpy as np
+
+from traffic_sim import TrafficSimulator
+
+BASELINE = (10, 10)
+
+class ComparisonJob:
+    def __init__(self, rate_ns, rate_ew, cycles, seed, replications=2000, chunk=100):
+        self.sim = TrafficSimulator(rate_ns, rate_ew, cycles)
+        self.seed = seed
+        self.replications = replications
+        self.chunk = chunk
+        self.best = None
+        self.completed = 0
+        self.error = None
+        self._sum = np.zeros((2, cycles))
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    def _run(self):
+        try:
+            rng = np.random.default_rng(self.seed)
+            (best_ns, best_ew), _, _ = self.sim.optimize_search('halving', min(self.replications, 500), rng)
+            with self._lock:
+                self.best = (int(best_ns), int(best_ew))
+            greens_ns = [BASELINE[0], best_ns]
+            greens_ew = [BASELINE[1], best_ew]
+            while self.completed < self.replications:
+                n = min(self.chunk, self.replications - self.completed)
+                series = self.sim.queue_series(greens_ns, greens_ew, self.sim.arrivals(n, rng))
+                with self._lock:
+                    self._sum += series.sum(axis=1)
+                    self.completed += n
+        except Exception as exc:  # surfaced in the UI instead of dying silently
+            self.error = exc
+        finally:
+            self._done.set()
+
+    def snapshot(self):
+        """(per-cycle mean queue for baseline and optimized, replications done, best config)."""
+        with self._lock:
+            if not self.completed:
+                return None, 0, self.best
+            return self._sum / self.completed, self.completed, self.best
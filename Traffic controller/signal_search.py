@@ -0,0 +1,109 @@
+"""
+Green-time search strategies for TrafficSimulator
+
+Every strategy scores candidates through an Evaluator, which holds one fixed
+set of arrival traces (common random numbers): all candidates are compared
+on the same traffic, so differences come from the signal plan and not from
+sampling noise. The Evaluator also counts simulator evaluations
+(configs x replications) so strategies can be compared on cost.
+
+Strategies:
+- grid      exhaustive grid, every config on all replications (like optimize())
+- halving   successive halving: score all configs on few replications, keep the
+            best 1/eta, multiply replications by eta, repeat
+- golden    coordinate search over continuous green times, golden-section
+            line search on one direction at a time
+"""
+
+import math
+
+import numpy as np
+
+class Evaluator:
+    """Mean wait of green-time configs on shared arrival traces."""
+
+    def __init__(self, sim, replications=1000, rng=None):
+        self.sim = sim
+        self.replications = replications
+        self.ns, self.ew = sim.arrivals(replications, rng)
+        self.evaluations = 0
+
+    def __call__(self, green_ns, green_ew, replications=None):
+        reps = self.replications if replications is None else min(replications, self.replications)
+        green_ns = np.atleast_1d(np.asarray(green_ns, dtype=np.float64))
+        green_ew = np.atleast_1d(np.asarray(green_ew, dtype=np.float64))
+        waits, _ = self.sim.run_batch(green_ns, green_ew, arrivals=(self.ns[:reps], self.ew[:reps]))
+        self.evaluations += waits.size
+        return waits.mean(axis=1)
+
+def grid_search(evaluate, ns_values=range(5, 31, 5), ew_values=range(5, 31, 5)):
+    ns_grid, ew_grid = np.meshgrid(np.asarray(ns_values), np.asarray(ew_values), indexing='ij')
+    ns_grid, ew_grid = ns_grid.ravel(), ew_grid.ravel()
+    waits = evaluate(ns_grid, ew_grid)
+    best = int(np.argmin(waits))
+    return (ns_grid[best], ew_grid[best]), float(waits[best])
+
+def successive_halving(evaluate, ns_values=range(5, 31, 5), ew_values=range(5, 31, 5), min_replications=32, eta=3):
+    ns_grid, ew_grid = np.meshgrid(np.asarray(ns_values), np.asarray(ew_values), indexing='ij')
+    ns_grid, ew_grid = ns_grid.ravel(), ew_grid.ravel()
+    reps = min_replications
+    while True:
+        waits = evaluate(ns_grid, ew_grid, reps)
+        if len(ns_grid) == 1 or reps >= evaluate.replications:
+            break
+        keep = np.argsort(waits, kind='stable')[:max(1, math.ceil(len(ns_grid) / eta))]
+        ns_grid, ew_grid = ns_grid[keep], ew_grid[keep]
+        reps *= eta
+    best = int(np.argmin(waits))
+    return (ns_grid[best], ew_grid[best]), float(waits[best])
+
+_INV_PHI = (math.sqrt(5) - 1) / 2
+
+def _golden(f, lo, hi, tol):
+    """Minimize a unimodal f on [lo, hi] by golden-section search."""
+    a, b = lo, hi
+    c = b - _INV_PHI * (b - a)
+    d = a + _INV_PHI * (b - a)
+    fc, fd = f(c), f(d)
+    while b - a > tol:
+        if fc <= fd:
+            b, d, fd = d, c, fc
+            c = b - _INV_PHI * (b - a)
+            fc = f(c)
+        else:
+            a, c, fc = c, d, fd
+            d = a + _INV_PHI * (b - a)
+            fd = f(d)
+    return (c, fc) if fc <= fd else (d, fd)
+
+def golden_search(evaluate, bounds=((5, 30), (5, 30)), start=(10, 10), tol=0.5, rounds=3):
+    """Coordinate descent over continuous (green_ns, green_ew), golden-section per axis."""
+    x = [float(v) for v in start]
+    best = float(evaluate(*x)[0])
+    for _ in range(rounds):
+        previous = list(x)
+        for axis, (lo, hi) in enumerate(bounds):
+            def f(v, axis=axis):
+                trial = list(x)
+                trial[axis] = v
+                return float(evaluate(*trial)[0])
+            v, fv = _golden(f, lo, hi, tol)
+            if fv <= best:
+                x[axis], best = v, fv
+        if np.allclose(previous, x, atol=tol):
+            break
+    return (x[0], x[1]), best
+
+STRATEGIES = {
+    'grid': grid_search,
+    'halving': successive_halving,
+    'golden': golden_search,
+}
+
+def search(sim, strategy='halving', replications=1000, rng=None, **options):
+    """Run one strategy on common random numbers.
+    Returns ((green_ns, green_ew), mean_wait, simulator_evaluations).
+    """
+    evaluate = Evaluator(sim, replications, rng)
+    config, wait = STRATEGIES[strategy](evaluate, **options)
+    return config, wait, evaluate.evaluations
@@ -51,3 +51,75 @@ class TrafficSimulator:
                     best_config = (ns, ew)
 
         return best_config, best_wait
+
+    def arrivals(self, replications, rng=None):
+        """Poisson arrivals for every replication and cycle, drawn in one call per direction.
+        Returns (ns, ew) integer arrays of shape (replications, cycles).
+        """
+        rng = np.random.default_rng(rng)
+        ns = rng.poisson(self.cars_rate_ns, size=(replications, self.cycles))
+        ew = rng.poisson(self.cars_rate_ew, size=(replications, self.cycles))
+        return ns, ew
+
+    @staticmethod
+    def _queues(arrivals, green):
+        """Queue left after each green phase for arrivals (..., cycles) and green (...).
+        The loop queue = max(queue + arrivals - green, 0) is a Lindley recursion, so it is
+        the running sum minus its running minimum (clipped at 0), with no per-cycle loop.
+        """
+        net = np.cumsum(arrivals - green[..., None], axis=-1)
+        return net - np.minimum(np.minimum.accumulate(net, axis=-1), 0)
+
+    def run_batch(self, green_ns, green_ew, replications=1000, rng=None, arrivals=None):
+        """Vectorized Monte Carlo version of run().
+
+        green_ns / green_ew: scalars or equal-length arrays of configs. All configs see
+        the same arrival traces (common random numbers). rng is a numpy Generator or
+        seed; pass arrivals from arrivals() to reuse traces across calls.
+        Returns (avg_wait, cars_passed), each of shape (configs, replications).
+        """
+        green_ns, green_ew = np.broadcast_arrays(np.atleast_1d(green_ns), np.atleast_1d(green_ew))
+        ns, ew = arrivals if arrivals is not None else self.arrivals(replications, rng)
+        cycles = ns.shape[-1]
+
+        queue_ns = self._queues(ns[None], green_ns[:, None])
+        queue_ew = self._queues(ew[None], green_ew[:, None])
+        total_wait = queue_ns.sum(axis=-1) + queue_ew.sum(axis=-1)
+        arrived = ns.sum(axis=-1) + ew.sum(axis=-1)
+        passed = arrived[None] - queue_ns[..., -1] - queue_ew[..., -1]
+        return total_wait / cycles, passed
+
+    def queue_series(self, green_ns, green_ew, arrivals):
+        """Total queue (NS + EW) after each cycle for every config and replication,
+        shape (configs, replications, cycles)."""
+        green_ns, green_ew = np.broadcast_arrays(np.atleast_1d(green_ns), np.atleast_1d(green_ew))
+        ns, ew = arrivals
+        return self._queues(ns[None], green_ns[:, None]) + self._queues(ew[None], green_ew[:, None])
+
+    def optimize_batch(self, replications=1000, rng=None, ns_values=range(5, 31, 5), ew_values=range(5, 31, 5)):
+        """Grid search like optimize(), but every config is averaged over the same
+        `replications` arrival traces in a single vectorized evaluation.
+        Returns ((best_ns, best_ew), mean_wait).
+        """
+        ns_grid, ew_grid = np.meshgrid(np.asarray(ns_values), np.asarray(ew_values), indexing='ij')
+        waits, _ = self.run_batch(ns_grid.ravel(), ew_grid.ravel(), replications, rng)
+        mean_wait = waits.mean(axis=1)
+        best = int(np.argmin(mean_wait))
+        return (int(ns_grid.ravel()[best]), int(ew_grid.ravel()[best])), float(mean_wait[best])
+
+    def optimize_search(self, strategy='halving', replications=1000, rng=None, **options):
+        """Optimize green times with a strategy from signal_search ('grid', 'halving', 'golden'),
+        comparing candidates on common random numbers.
+        Returns ((green_ns, green_ew), mean_wait, simulator_evaluations).
+        """
+        from signal_search import search
+        return search(self, strategy, replications, rng, **options)
+
+    def run_events(self, green_ns, green_ew, rng=None, headway=1.0):
+        """Event-driven per-vehicle mode: exact delay of every vehicle.
+        Returns p50/p95/p99 and mean delay (seconds), throughput and event counts
+        (see event_sim.simulate_events).
+        """
+        from event_sim import simulate_events
+        return simulate_events(self.cars_rate_ns, self.cars_rate_ew, green_ns, green_ew,
+                               self.cycles, rng, headway)
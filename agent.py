@@ -9,15 +9,22 @@ Files:
 
 Run:
 $ python agent.py --input sample_data/vehicles.json --slots sample_data/slots.json --out allocations.csv
+
+Library use (no subprocess): load_inputs (or load_json) -> solve -> save_allocations, or
+allocate() for all of it; app.py calls these directly.
 """
 
 import argparse
 import json
-import csv
+import sys
 import time
 from math import inf
 
-# Fallback pure-Python implementation of Hungarian (for small matrices)
+from allocation_log import AllocationLogWriter
+from telemetry import tracer
+
+# Without SciPy, assignment falls back to the NumPy solvers in lapsolve.py
+# (and to a greedy loop if NumPy is missing too).
 # For production, use scipy.optimize.linear_sum_assignment if available.
 try:
     from scipy.optimize import linear_sum_assignment
@@ -25,47 +32,103 @@ try:
 except Exception:
     SCIPY_AVAILABLE = False
 
+try:
+    import numpy as np
+    import lapsolve
+    import input_loader
+    NUMPY_AVAILABLE = True
+except Exception:
+    NUMPY_AVAILABLE = False
+
+DEFAULT_WEIGHTS = {'distance': 1.0, 'size_penalty': 1000.0, 'priority': -10.0}
+
+def pair_cost(car, slot, weights):
+    """Cost of parking a single car in a single slot."""
+    dist = slot.get('distance', 0)
+    cost = weights['distance'] * dist
+
+    # Size compatibility penalty
+    if car.get('size') != slot.get('size'):
+        cost += weights['size_penalty']
+
+    # Priority adjustment
+    priority = slot.get('priority', 0)
+    cost += weights['priority'] * priority
+    return cost
+
 def build_cost_matrix(cars, slots, weights=None):
     """Build cost matrix: rows=cars, cols=slots.
     weights: dict controlling cost components, e.g. {'distance':1.0, 'size_penalty':1000, 'priority':-50}
     """
     if weights is None:
-        weights = {'distance': 1.0, 'size_penalty': 1000.0, 'priority': -10.0}
+        weights = DEFAULT_WEIGHTS
 
-    matrix = []
-    for car in cars:
-        row = []
-        for slot in slots:
-            dist = slot.get('distance', 0)
-            cost = weights['distance'] * dist
+    with tracer.span('build_cost_matrix', rows=len(cars), cols=len(slots), backend='python'):
+        matrix = []
+        for car in cars:
+            matrix.append([pair_cost(car, slot, weights) for slot in slots])
+    tracer.gauge('matrix_rows', len(cars))
+    tracer.gauge('matrix_cols', len(slots))
+    return matrix
 
-            # Size compatibility penalty
-            if car.get('size') != slot.get('size'):
-                cost += weights['size_penalty']
+def encode_sizes(cars, slots):
+    """Map size labels to small integer codes shared by cars and slots.
+    Returns (car_codes, slot_codes) as int16 arrays; equal labels get equal codes
+    (a missing size is treated as its own label, like the dict comparison does).
+    """
+    codes = {}
 
-            # Priority adjustment
-            priority = slot.get('priority', 0)
-            cost += weights['priority'] * priority
+    def encode(items):
+        if hasattr(items, 'size_codes'):
+            # input_loader table: remap its interned categories onto the shared codes
+            lut = np.array([codes.setdefault(s, len(codes)) for s in items.sizes], dtype=np.int16)
+            return lut[items.size_codes] if len(lut) else np.zeros(len(items), dtype=np.int16)
+        return np.fromiter((codes.setdefault(x.get('size'), len(codes)) for x in items),
+                           dtype=np.int16, count=len(items))
 
-            row.append(cost)
-        matrix.append(row)
+    car_codes = encode(cars)
+    slot_codes = encode(slots)
+    return car_codes, slot_codes
+
+def encode_slots(slots):
+    """Return (distance, priority) float64 arrays for the slot list."""
+    if hasattr(slots, 'distance'):
+        return np.asarray(slots.distance, dtype=np.float64), np.asarray(slots.priority, dtype=np.float64)
+    dist = np.fromiter((s.get('distance', 0) for s in slots), dtype=np.float64, count=len(slots))
+    prio = np.fromiter((s.get('priority', 0) for s in slots), dtype=np.float64, count=len(slots))
+    return dist, prio
+
+def cost_block(car_codes, slot_codes, dist, prio, weights, dtype=None):
+    """Cost matrix from already encoded columns (see encode_sizes / encode_slots)."""
+    dtype = np.float64 if dtype is None else dtype
+    # Same order of operations as build_cost_matrix so float results are identical
+    matrix = np.empty((len(car_codes), len(slot_codes)), dtype=dtype)
+    np.not_equal(car_codes[:, None], slot_codes[None, :], out=matrix, casting='unsafe')
+    matrix *= weights['size_penalty']
+    matrix += weights['distance'] * dist
+    matrix += weights['priority'] * prio
     return matrix
 
-def assign_hungarian(cost_matrix):
-    """Return list of (row_idx, col_idx) assignments and total cost.
-    Uses scipy if available, otherwise fallback greedy.
+def build_cost_array(cars, slots, weights=None, dtype=None):
+    """Vectorized build_cost_matrix: same costs, returned as an ndarray (rows=cars, cols=slots).
+    Slot attributes and size codes are encoded once, then the matrix is formed by broadcasting.
+    dtype defaults to float64; pass np.float32 to halve memory on large garages.
     """
-    n_rows = len(cost_matrix)
-    n_cols = len(cost_matrix[0]) if n_rows else 0
+    if weights is None:
+        weights = DEFAULT_WEIGHTS
+    dtype = np.float64 if dtype is None else dtype
 
-    if SCIPY_AVAILABLE:
-        import numpy as np
-        arr = np.array(cost_matrix)
-        row_ind, col_ind = linear_sum_assignment(arr)
-        total = arr[row_ind, col_ind].sum()
-        return list(zip(list(map(int, row_ind)), list(map(int, col_ind)))), float(total)
+    with tracer.span('build_cost_matrix', rows=len(cars), cols=len(slots), backend='numpy',
+                     dtype=np.dtype(dtype).name):
+        car_codes, slot_codes = encode_sizes(cars, slots)
+        dist, prio = encode_slots(slots)
+        matrix = cost_block(car_codes, slot_codes, dist, prio, weights, dtype)
+    tracer.gauge('matrix_rows', len(cars))
+    tracer.gauge('matrix_cols', len(slots))
+    return matrix
 
-    # Fallback greedy assignment (not globally optimal)
+def assign_greedy(cost_matrix):
+    """Row-by-row greedy assignment (not globally optimal). Pure Python, no dependencies."""
     assignments = []
     used_cols = set()
     total = 0.0
@@ -82,58 +145,236 @@ def assign_hungarian(cost_matrix):
             assignments.append((r, best_c))
             used_cols.add(best_c)
             total += best_cost
+    return assignments, float(total)
+
+def assign_hungarian(cost_matrix, method=None):
+    """Return list of (row_idx, col_idx) assignments and total cost.
+    Accepts a list of lists or an ndarray (used as-is, no copy).
+    method: 'scipy', 'hungarian' (NumPy O(n^3)), 'auction' (NumPy, large rectangular
+    problems) or 'greedy'. Default: scipy if available, else the NumPy Hungarian,
+    else greedy.
+    """
+    # fallback: the default backend had to be replaced because SciPy is missing
+    fallback = method is None and not SCIPY_AVAILABLE
+    if method is None:
+        method = 'scipy' if SCIPY_AVAILABLE else 'hungarian' if NUMPY_AVAILABLE else 'greedy'
+
+    rows = len(cost_matrix)
+    cols = len(cost_matrix[0]) if rows else 0
+    with tracer.span('assign_hungarian', method=method, fallback=fallback, rows=rows, cols=cols) as sp:
+        if method == 'greedy':
+            assignments, total = assign_greedy(cost_matrix)
+        else:
+            arr = np.asarray(cost_matrix)
+            if method == 'scipy':
+                row_ind, col_ind = linear_sum_assignment(arr)
+            elif method == 'hungarian':
+                row_ind, col_ind = lapsolve.hungarian(arr)
+            elif method == 'auction':
+                row_ind, col_ind = lapsolve.auction(arr)
+            else:
+                raise ValueError(f'unknown assignment method: {method}')
+            total = float(arr[row_ind, col_ind].sum())
+            assignments = list(zip(list(map(int, row_ind)), list(map(int, col_ind))))
+        sp.set(assigned=len(assignments))
+    tracer.count('assignments_total', len(assignments), method=method)
     return assignments, total
 
-def save_allocations(assignments, cars, slots, out_csv, timestamp=None):
+def _cheapest(cols, base, n):
+    """Return the n columns of cols with the lowest base cost (all of them if fewer)."""
+    if n >= len(cols):
+        return cols
+    return cols[np.argpartition(base[cols], n - 1)[:n]]
+
+def assign_partitioned(cars, slots, weights=None):
+    """Size-partitioned assignment following a "same size first" rule.
+
+    Incompatible car/slot pairs are never materialised. Cars are matched within
+    their own size class first; only cars left over once their class has no
+    capacity are assigned across sizes (paying size_penalty) to the slots still free.
+    A slot's cost does not depend on which car of a class takes it, so every car
+    of a class is interchangeable: the class simply takes its cheapest slots, with
+    no assignment solve and memory O(cars + slots) instead of O(cars x slots).
+
+    The result equals the dense optimum only while size_penalty is at least the
+    spread of the slots' distance/priority cost; with smaller custom weights a
+    cross-size seat can be cheaper and this rule may cost more than --solver dense.
+    Returns (assignments, total) like assign_hungarian.
+    """
+    if weights is None:
+        weights = DEFAULT_WEIGHTS
+
+    car_codes, slot_codes = encode_sizes(cars, slots)
+    dist, prio = encode_slots(slots)
+    base = weights['distance'] * dist + weights['priority'] * prio
+
+    pair_rows = []
+    pair_cols = []
+    free = np.ones(len(slots), dtype=bool)
+    leftover = []
+
+    def seat(rows, cols):
+        # Every row has the same cost for a given column, so any pairing of the
+        # rows with the (at most len(rows)) cheapest columns is optimal
+        cols = cols[np.argsort(base[cols], kind='stable')]
+        k = len(cols)
+        pair_rows.append(rows[:k])
+        pair_cols.append(cols)
+        free[cols] = False
+        return rows[k:]
+
+    for code in np.unique(car_codes):
+        rows = np.flatnonzero(car_codes == code)
+        cols = _cheapest(np.flatnonzero(slot_codes == code), base, len(rows))
+        leftover.append(seat(rows, cols))
+
+    # Cross-size fallback for classes that ran out of capacity
+    rows = np.concatenate(leftover) if leftover else np.empty(0, dtype=np.intp)
+    if len(rows) and free.any():
+        seat(rows, _cheapest(np.flatnonzero(free), base, len(rows)))
+
+    if not pair_rows:
+        return [], 0.0
+    r = np.concatenate(pair_rows)
+    c = np.concatenate(pair_cols)
+    order = np.argsort(r, kind='stable')
+    r, c = r[order], c[order]
+    costs = base[c] + weights['size_penalty'] * (car_codes[r] != slot_codes[c])
+    return list(zip(r.tolist(), c.tolist())), float(costs.sum())
+
+def save_allocations(assignments, cars, slots, out_csv, timestamp=None, writer=None):
+    """Append assignment rows to the allocation log.
+    Pass an open AllocationLogWriter to batch rows across calls; otherwise a
+    one-off writer for out_csv (format chosen by its extension) is used.
+    """
     ts = timestamp or int(time.time())
-    header = ['timestamp', 'car_id', 'car_size', 'slot_id', 'slot_size', 'cost']
-
-    write_header = False
-    try:
-        with open(out_csv, 'r') as _:
-            write_header = False
-    except FileNotFoundError:
-        write_header = True
-
-    with open(out_csv, 'a', newline='') as f:
-        writer = csv.writer(f)
-        if write_header:
-            writer.writerow(header)
+    # With a shared writer the rows are only buffered here; the file write is
+    # timed by the writer's allocation_log_flush / allocation_log_close spans
+    with tracer.span('save_allocations', rows_written=len(assignments), out=out_csv or writer.path,
+                     buffered=writer is not None):
+        rows = []
         for (r, c), cost in assignments:
             car = cars[r]
             slot = slots[c]
-            writer.writerow([ts, car.get('id'), car.get('size'), slot.get('id'), slot.get('size'), cost])
+            rows.append((ts, car.get('id'), car.get('size'), slot.get('id'), slot.get('size'), cost))
+
+        if writer is not None:
+            writer.write_rows(rows)
+        else:
+            with AllocationLogWriter(out_csv) as log:
+                log.write_rows(rows)
+    tracer.count('rows_written_total', len(rows))
 
 def load_json(path):
-    with open(path, 'r') as f:
-        return json.load(f)
+    with tracer.span('load_json', path=path) as sp:
+        with open(path, 'r') as f:
+            data = json.load(f)
+        sp.set(records=len(data))
+    return data
+
+def load_inputs(cars_path, slots_path, cache=False):
+    """Validated columnar vehicles/slots via input_loader (see there); cache=True reuses
+    memory-mapped .npy columns while the JSON files are unchanged.
+    Without NumPy this is plain load_json."""
+    if not NUMPY_AVAILABLE:
+        return load_json(cars_path), load_json(slots_path)
+    out = []
+    for path, load in ((cars_path, input_loader.load_vehicles), (slots_path, input_loader.load_slots)):
+        with tracer.span('load_json', path=path, loader='columnar', cache=cache) as sp:
+            data = load(path, cache=cache)
+            sp.set(records=len(data))
+        out.append(data)
+    return out
+
+def solve(cars, slots, weights=None, solver='dense', method=None, workers=None):
+    """Assign cars to slots in-process.
+    solver: 'dense' (one assignment over all pairs), 'partitioned' (per size class, same size first) or
+    'sharded' (per lot in a process pool of `workers`, see sharded.py).
+    Returns (assignments, total) with assignments as [((car_idx, slot_idx), cost), ...].
+    """
+    if solver == 'sharded':
+        import sharded
+        return sharded.assign_sharded(cars, slots, weights, workers, method)
+
+    if solver == 'partitioned':
+        pairs, total = assign_partitioned(cars, slots, weights)
+        return [((r, c), pair_cost(cars[r], slots[c], weights or DEFAULT_WEIGHTS)) for r, c in pairs], total
+
+    if NUMPY_AVAILABLE:
+        cost_matrix = build_cost_array(cars, slots, weights)
+    else:
+        cost_matrix = build_cost_matrix(cars, slots, weights)
+    pairs, total = assign_hungarian(cost_matrix, method)
+    return [((r, c), float(cost_matrix[r][c])) for r, c in pairs], total
+
+def summarize(assignments, cars, slots, total):
+    """Result dict in the CLI's output format: {'assignments': [{car, slot, cost}], 'total_cost'}."""
+    out = [{'car': cars[r]['id'], 'slot': slots[c]['id'], 'cost': cost} for (r, c), cost in assignments]
+    return {'assignments': out, 'total_cost': total}
+
+def allocate(cars, slots, out=None, weights=None, solver='dense', method=None, writer=None, timestamp=None,
+             workers=None):
+    """Solve and record in one call (what the CLI does, without the process).
+    Rows go to `writer` if given, else to the log at `out` (not recorded if both are None).
+    Returns the summarize() dict.
+    """
+    assignments, total = solve(cars, slots, weights, solver, method, workers)
+    if writer is not None or out is not None:
+        save_allocations(assignments, cars, slots, out, timestamp=timestamp, writer=writer)
+    return summarize(assignments, cars, slots, total)
 
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument('--input', required=True, help='vehicles JSON file')
     parser.add_argument('--slots', required=True, help='slots JSON file')
-    parser.add_argument('--out', default='allocations.csv')
+    parser.add_argument('--out', default='allocations.csv', help='allocation log (.csv, .parquet or .arrow)')
+    parser.add_argument('--rotate', choices=['hourly', 'daily'], help='partition the log by timestamp')
     parser.add_argument('--weights', help='optional JSON with weights')
+    parser.add_argument('--solver', choices=['dense', 'partitioned', 'sharded'], default='dense',
+                        help='dense: one Hungarian solve over all pairs (optimal); partitioned: per size class, '
+                             '"same size first" (optimal only if size_penalty >= the spread of slot costs); '
+                             'sharded: per lot (slot ID prefix letter) in parallel')
+    parser.add_argument('--workers', type=int, help='processes for --solver sharded (default: CPU count)')
+    parser.add_argument('--gap-report', action='store_true',
+                        help='with --solver sharded, print the gap vs the dense solve (size-partitioned '
+                             'above 25M cells, not optimal) to stderr')
+    parser.add_argument('--method', choices=['scipy', 'hungarian', 'auction', 'greedy'],
+                        help='assignment backend (default: scipy if installed, else NumPy hungarian; '
+                             'auction needs costs with at most 6 decimals)')
+    parser.add_argument('--cache', action='store_true',
+                        help='keep parsed inputs as memory-mapped .npy next to the JSON and reuse them')
+    parser.add_argument('--trace', metavar='PATH', help="append span records as JSON lines to PATH ('-' for stderr)")
+    parser.add_argument('--metrics', metavar='PATH', help='write Prometheus text-format metrics to PATH')
     args = parser.parse_args()
+    tracer.enabled = bool(args.trace or args.metrics)
 
-    cars = load_json(args.input)
-    slots = load_json(args.slots)
+    cars, slots = load_inputs(args.input, args.slots, cache=args.cache)
 
     weights = None
     if args.weights:
         weights = load_json(args.weights)
 
-    cost_matrix = build_cost_matrix(cars, slots, weights)
-    assignment_pairs, total = assign_hungarian(cost_matrix)
+    # allocate() inlined so the solve can be timed for --gap-report
+    with AllocationLogWriter(args.out, rotate=args.rotate) as log:
+        t0 = time.perf_counter()
+        assignments, total = solve(cars, slots, weights, args.solver, args.method, args.workers)
+        solve_seconds = time.perf_counter() - t0
+        save_allocations(assignments, cars, slots, None, writer=log)
+    result = summarize(assignments, cars, slots, total)
 
-    # Enrich assignments with cost
-    assignments_with_cost = [((r, c), cost_matrix[r][c]) for r, c in assignment_pairs]
+    if args.gap_report and args.solver == 'sharded':
+        import sharded
+        report = sharded.gap_report(cars, slots, weights, args.workers, args.method,
+                                    sharded_total=total, sharded_seconds=solve_seconds)
+        print(json.dumps(report, indent=2), file=sys.stderr)
 
-    save_allocations(assignments_with_cost, cars, slots, args.out)
+    if args.trace:
+        tracer.write_json(args.trace)
+    if args.metrics:
+        tracer.write_prometheus(args.metrics)
 
     # Print friendly output
-    out = [{'car': cars[r]['id'], 'slot': slots[c]['id'], 'cost': cost} for (r, c), cost in assignments_with_cost]
-    print(json.dumps({'assignments': out, 'total_cost': total}, indent=2))
+    print(json.dumps(result, indent=2))
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Buffered Allocation Log Writer
+
+Batches allocation rows in memory and flushes them when either the row
+threshold or the time threshold is reached (checked on each write; call
+flush()/close() or use the writer as a context manager at shutdown).
+
+Sinks, chosen from the output extension:
+- .csv      appended text with the usual header (same format as before)
+- .parquet  typed columns via pyarrow, one row group per flush
+- .arrow    Arrow IPC stream, one record batch per flush
+
+Rotation:
+- rotate='hourly' / 'daily' partitions rows by their timestamp, e.g.
+  allocations.csv -> allocations-2026101714.csv / allocations-20261017.csv
+- max_bytes rolls a CSV over to allocations.1.csv, allocations.2.csv, ...
+Columnar files cannot be appended to, so every writer session opens its own
+part file (allocations[-partition]-<session>.parquet) and never overwrites.
+
+tail_rows() returns the last rows of a CSV log without reading the whole file.
+"""
+
+import csv
+import glob
+import os
+import time
+
+from telemetry import tracer
+
+HEADER = ['timestamp', 'car_id', 'car_size', 'slot_id', 'slot_size', 'cost']
+
+PARTITION_FORMATS = {'hourly': '%Y%m%d%H', 'daily': '%Y%m%d'}
+
+def _arrow_schema():
+    import pyarrow as pa
+    return pa.schema([
+        ('timestamp', pa.int64()),
+        ('car_id', pa.string()),
+        ('car_size', pa.string()),
+        ('slot_id', pa.string()),
+        ('slot_size', pa.string()),
+        ('cost', pa.float64()),
+    ])
+
+class _CsvSink:
+    def __init__(self, path, max_bytes=None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.seq = 0
+
+    def _current(self):
+        if not self.max_bytes:
+            return self.path
+        stem, ext = os.path.splitext(self.path)
+        while True:
+            path = self.path if self.seq == 0 else f'{stem}.{self.seq}{ext}'
+            if not os.path.exists(path) or os.path.getsize(path) < self.max_bytes:
+                return path
+            self.seq += 1
+
+    def write(self, rows):
+        path = self._current()
+        write_header = not os.path.exists(path) or os.path.getsize(path) == 0
+        with open(path, 'a', newline='') as f:
+            writer = csv.writer(f)
+            if write_header:
+                writer.writerow(HEADER)
+            writer.writerows(rows)
+
+    def close(self):
+        pass
+
+class _ArrowSink:
+    def __init__(self, path, fmt, session):
+        stem, ext = os.path.splitext(path)
+        self.path = f'{stem}-{session}{ext}'
+        self.fmt = fmt
+        self.schema = _arrow_schema()
+        self.writer = None
+
+    def write(self, rows):
+        import pyarrow as pa
+
+        columns = list(zip(*rows))
+        # Ids may be ints (input_loader keeps the JSON type); the log stores them as text like the CSV
+        columns = [[v if v is None else str(v) for v in col] if field.type == pa.string() else col
+                   for col, field in zip(columns, self.schema)]
+        batch = pa.record_batch([pa.array(col, type=field.type) for col, field in zip(columns, self.schema)],
+                                schema=self.schema)
+        if self.writer is None:
+            if self.fmt == 'parquet':
+                import pyarrow.parquet as pq
+                self.writer = pq.ParquetWriter(self.path, self.schema)
+            else:
+                self.writer = pa.ipc.new_stream(self.path, self.schema)
+        self.writer.write_batch(batch)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+class AllocationLogWriter:
+    """Buffered, optionally partitioned writer for allocation rows.
+
+    Rows are tuples in HEADER order. max_rows / max_seconds are the flush
+    thresholds; rotate is None, 'hourly' or 'daily'; max_bytes rolls CSV files.
+    """
+
+    def __init__(self, path, fmt=None, max_rows=5000, max_seconds=5.0, rotate=None, max_bytes=None):
+        if fmt is None:
+            fmt = os.path.splitext(path)[1].lstrip('.').lower() or 'csv'
+        if fmt not in ('csv', 'parquet', 'arrow'):
+            raise ValueError(f'unsupported log format: {fmt}')
+        if rotate is not None and rotate not in PARTITION_FORMATS:
+            raise ValueError(f'unsupported rotation: {rotate}')
+        self.path = path
+        self.fmt = fmt
+        self.max_rows = max_rows
+        self.max_seconds = max_seconds
+        self.rotate = rotate
+        self.max_bytes = max_bytes
+        self.session = time.strftime('%Y%m%d%H%M%S') + f'-{os.getpid()}'
+        self.rows_written = 0
+        self._buffer = []
+        self._last_flush = time.monotonic()
+        self._sinks = {}
+
+    def _partition_path(self, key):
+        if key is None:
+            return self.path
+        stem, ext = os.path.splitext(self.path)
+        return f'{stem}-{key}{ext}'
+
+    def _sink(self, key):
+        sink = self._sinks.get(key)
+        if sink is None:
+            path = self._partition_path(key)
+            if self.fmt == 'csv':
+                sink = _CsvSink(path, self.max_bytes)
+            else:
+                sink = _ArrowSink(path, self.fmt, self.session)
+            self._sinks[key] = sink
+        return sink
+
+    def write_row(self, row):
+        self._buffer.append(row)
+        self._maybe_flush()
+
+    def write_rows(self, rows):
+        self._buffer.extend(rows)
+        self._maybe_flush()
+
+    def _maybe_flush(self):
+        if len(self._buffer) >= self.max_rows or time.monotonic() - self._last_flush >= self.max_seconds:
+            self.flush()
+
+    def flush(self):
+        self._last_flush = time.monotonic()
+        if not self._buffer:
+            return
+        rows, self._buffer = self._buffer, []
+        with tracer.span('allocation_log_flush', rows=len(rows), format=self.fmt):
+            if self.rotate is None:
+                groups = {None: rows}
+            else:
+                fmt = PARTITION_FORMATS[self.rotate]
+                groups = {}
+                for row in rows:
+                    key = time.strftime(fmt, time.gmtime(int(row[0])))
+                    groups.setdefault(key, []).append(row)
+            for key, group in groups.items():
+                self._sink(key).write(group)
+        self.rows_written += len(rows)
+
+    def close(self):
+        self.flush()
+        with tracer.span('allocation_log_close', format=self.fmt, files=len(self._sinks)):
+            for sink in self._sinks.values():
+                sink.close()
+        self._sinks.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def log_files(path):
+    """All files a writer with base `path` may have produced (any partition/part), sorted."""
+    stem, ext = os.path.splitext(path)
+    stem = glob.escape(stem)
+    found = set(glob.glob(stem + ext)) | set(glob.glob(stem + '-*' + ext)) | set(glob.glob(stem + '.*' + ext))
+    return sorted(found)
+
+def tail_rows(path, n=20, block=64 << 10):
+    """Last n rows of a CSV log as (header, rows), reading only the end of the file."""
+    with open(path, 'rb') as f:
+        first = f.readline().decode('utf-8')
+        header = next(csv.reader([first])) if first.strip() else HEADER
+        start = f.tell()
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        data = b''
+        # Read backwards until the buffer holds n complete lines (or reaches the header)
+        while pos > start and data.count(b'\n') <= n:
+            step = min(block, pos - start)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+    lines = data.splitlines()
+    if pos > start:
+        lines = lines[1:]   # first line may be partial
+    rows = list(csv.reader(line.decode('utf-8') for line in lines[-n:] if line))
+    return header, rows
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Streaming Parking Allocation Service
+
+Keeps slot occupancy in memory and updates the assignment one event at a
+time instead of re-solving from scratch like agent.main.
+
+A car's cost in a slot is the slot's base cost (distance and priority terms)
+plus size_penalty when the sizes differ, so cars of the same size are
+interchangeable. Repairs therefore run on a tiny graph whose nodes are size
+classes: a car of size a can take a free slot, or take a slot of size b held
+by a car of size c (delta = P[a != b] - P[c != b]) which then needs a slot
+itself. The shortest such augmenting path is the optimal insertion; on
+departure the most expensive car of each class is re-inserted if that helps.
+Assignments are reservations, so repairs may move already-allocated cars;
+those moves are reported with each decision.
+
+Events (one JSON value per line on stdin, a list is a micro-batch):
+  {"type": "arrive", "car": {"id": "car_101", "size": "small"}}
+  {"type": "depart", "car_id": "car_101"}
+  {"type": "rebalance"}
+A rejected event (duplicate arrival, unknown car, bad JSON) prints an
+{"error": ...} line instead of a decision and the service keeps reading.
+
+Run:
+$ python allocation_service.py --slots slots.json < events.jsonl
+"""
+
+import argparse
+import heapq
+import json
+import sys
+from collections import defaultdict, deque
+
+from agent import DEFAULT_WEIGHTS, pair_cost, load_json
+
+class AllocationService:
+    """In-memory slot occupancy with incremental (augmenting-path) repair."""
+
+    def __init__(self, slots, weights=None):
+        self.weights = weights or DEFAULT_WEIGHTS
+        self.slots = list(slots)
+        self.slot_size = [s.get('size') for s in self.slots]
+        self.base = [self.weights['distance'] * s.get('distance', 0) +
+                     self.weights['priority'] * s.get('priority', 0) for s in self.slots]
+        self.slot_car = [None] * len(self.slots)
+        self.cars = {}              # car_id -> car dict
+        self.car_slot = {}          # car_id -> slot index
+        self.waiting = deque()      # cars that arrived while the garage was full
+
+        # Lazy heaps: entries are checked against slot_car when popped
+        self._free = defaultdict(list)   # slot size -> [(base, slot)]
+        self._held = defaultdict(list)   # (car size, slot size) -> [(-base, slot)]
+        for j, size in enumerate(self.slot_size):
+            self._free[size].append((self.base[j], j))
+        for heap in self._free.values():
+            heapq.heapify(heap)
+
+    # ------------------------------------------------------------------
+    # Occupancy bookkeeping
+    # ------------------------------------------------------------------
+    def _penalty(self, car_size, slot_size):
+        return self.weights['size_penalty'] if car_size != slot_size else 0.0
+
+    def _push(self, heap, entry, valid):
+        heapq.heappush(heap, entry)
+        # Drop stale entries once they outnumber the slots, so long runs stay bounded
+        if len(heap) > 2 * len(self.slots) + 64:
+            heap[:] = list({e[1]: e for e in heap if valid(e[1])}.values())
+            heapq.heapify(heap)
+
+    def _place(self, car, j):
+        self.slot_car[j] = car['id']
+        self.car_slot[car['id']] = j
+        size = car.get('size')
+        self._push(self._held[(size, self.slot_size[j])], (-self.base[j], j),
+                   lambda k: self.slot_car[k] is not None and self.cars[self.slot_car[k]].get('size') == size)
+
+    def _vacate(self, j):
+        car_id = self.slot_car[j]
+        self.slot_car[j] = None
+        del self.car_slot[car_id]
+        self._push(self._free[self.slot_size[j]], (self.base[j], j), lambda k: self.slot_car[k] is None)
+        return car_id
+
+    def _top_free(self, slot_size):
+        heap = self._free[slot_size]
+        while heap and self.slot_car[heap[0][1]] is not None:
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+    def _top_held(self, car_size, slot_size):
+        heap = self._held[(car_size, slot_size)]
+        while heap:
+            j = heap[0][1]
+            car_id = self.slot_car[j]
+            if car_id is not None and self.cars[car_id].get('size') == car_size:
+                return heap[0]
+            heapq.heappop(heap)
+        return None
+
+    # ------------------------------------------------------------------
+    # Augmenting paths over size classes
+    # ------------------------------------------------------------------
+    def _shortest_path(self, size):
+        """Cheapest way to seat one more car of `size`.
+        Returns (cost, hops, free_slot) where hops is [(slot, displaced car size), ...]
+        in order along the path, or None when no slot is free.
+        """
+        slot_sizes = list(self._free)
+        car_sizes = {size} | {c for c, _ in self._held}
+        dist = {size: 0.0}
+        pred = {}
+        # Bellman-Ford: at most len(car_sizes) - 1 displacement hops
+        for _ in range(len(car_sizes) - 1):
+            changed = False
+            for a in list(dist):
+                for c in car_sizes:
+                    if c == a or c == size:
+                        continue
+                    for b in slot_sizes:
+                        if self._top_held(c, b) is None:
+                            continue
+                        d = dist[a] + self._penalty(a, b) - self._penalty(c, b)
+                        if d < dist.get(c, float('inf')) - 1e-12:
+                            dist[c] = d
+                            pred[c] = (a, b)
+                            changed = True
+            if not changed:
+                break
+
+        best = None
+        for a, d in dist.items():
+            for b in slot_sizes:
+                top = self._top_free(b)
+                if top is None:
+                    continue
+                total = d + top[0] + self._penalty(a, b)
+                if best is None or total < best[0]:
+                    best = (total, a, top[1])
+        if best is None:
+            return None
+
+        total, last, free_slot = best
+        hops = []
+        node = last
+        while node != size:
+            a, b = pred[node]
+            hops.append((self._top_held(node, b)[1], node))
+            node = a
+        hops.reverse()
+        return total, hops, free_slot
+
+    def _insert(self, car):
+        """Seat `car` along the shortest augmenting path. Returns list of moves or None."""
+        path = self._shortest_path(car.get('size'))
+        if path is None:
+            return None
+        _, hops, free_slot = path
+        slots = [j for j, _ in hops] + [free_slot]
+        movers = [car] + [self.cars[self.slot_car[j]] for j, _ in hops]
+        moves = []
+        for j in slots[:-1]:
+            self._vacate(j)
+        for mover, old, new in zip(movers, [None] + slots[:-1], slots):
+            self._place(mover, new)
+            if old is not None:
+                moves.append({'car': mover['id'], 'from': self.slots[old]['id'], 'to': self.slots[new]['id']})
+        return moves
+
+    def _repair(self):
+        """Re-seat the most expensive car of a class if a cheaper path now exists."""
+        moves = []
+        for _ in range(len(self._held) + 1):
+            best = None
+            for car_size, slot_size in list(self._held):
+                top = self._top_held(car_size, slot_size)
+                if top is None:
+                    continue
+                j = top[1]
+                current = self.base[j] + self._penalty(car_size, slot_size)
+                car_id = self.slot_car[j]
+                self._vacate(j)
+                path = self._shortest_path(car_size)
+                self._place(self.cars[car_id], j)
+                if path is not None and path[0] < current - 1e-9:
+                    gain = current - path[0]
+                    if best is None or gain > best[0]:
+                        best = (gain, j)
+            if best is None:
+                break
+            j = best[1]
+            car = self.cars[self.slot_car[j]]
+            self._vacate(j)
+            step = self._insert(car)
+            new = self.car_slot[car['id']]
+            moves.append({'car': car['id'], 'from': self.slots[j]['id'], 'to': self.slots[new]['id']})
+            moves.extend(step)
+        return moves
+
+    def _decision(self, car, moves):
+        j = self.car_slot.get(car['id'])
+        slot = self.slots[j] if j is not None else None
+        return {
+            'car': car['id'],
+            'slot': slot['id'] if slot else None,
+            'cost': pair_cost(car, slot, self.weights) if slot else None,
+            'moves': moves,
+        }
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def arrive(self, car):
+        """Allocate a slot for an arriving car. Queues the car if the garage is full."""
+        if car['id'] in self.cars:
+            raise ValueError(f"car {car['id']} is already allocated")
+        self.cars[car['id']] = car
+        moves = self._insert(car)
+        if moves is None:
+            self.waiting.append(car)
+            moves = []
+        return self._decision(car, moves)
+
+    def depart(self, car_id):
+        """Release a car's slot, then seat a waiting car or repair the matching."""
+        car = self.cars.get(car_id)
+        if car is None:
+            raise KeyError(car_id)
+        if car_id not in self.car_slot:
+            self.waiting.remove(car)
+            del self.cars[car_id]
+            return {'car': car_id, 'slot': None, 'cost': None, 'moves': []}
+        j = self.car_slot[car_id]
+        self._vacate(j)
+        del self.cars[car_id]
+
+        if self.waiting:
+            nxt = self.waiting.popleft()
+            moves = self._insert(nxt)
+            moves.append({'car': nxt['id'], 'from': None, 'to': self.slots[self.car_slot[nxt['id']]]['id']})
+        else:
+            moves = self._repair()
+        return {'car': car_id, 'slot': self.slots[j]['id'], 'cost': None, 'moves': moves}
+
+    def handle(self, event):
+        """Apply one event dict and return its decision."""
+        kind = event.get('type')
+        if kind == 'arrive':
+            return self.arrive(event['car'])
+        if kind == 'depart':
+            return self.depart(event['car_id'])
+        if kind == 'rebalance':
+            return {'moves': self.rebalance()}
+        raise ValueError(f'unknown event type: {kind}')
+
+    def submit(self, events):
+        """Apply a micro-batch of events in order."""
+        return [self.handle(e) for e in events]
+
+    def rebalance(self):
+        """Full dense re-solve of all current cars. The result is only applied if it
+        seats more cars or lowers the total cost; only changed seats are reported."""
+        from agent import solve
+
+        cars = list(self.cars.values())
+        pairs, total = solve(cars, self.slots, self.weights)
+        if len(pairs) == len(self.car_slot) and total >= self.total_cost() - 1e-9:
+            return []
+        pairs = [p for p, _ in pairs]
+        old = dict(self.car_slot)
+        for j in list(old.values()):
+            self._vacate(j)
+        self.waiting.clear()
+        seated = set()
+        for r, c in pairs:
+            self._place(cars[r], c)
+            seated.add(r)
+        self.waiting.extend(car for r, car in enumerate(cars) if r not in seated)
+
+        moves = []
+        for car_id, j in self.car_slot.items():
+            if old.get(car_id) != j:
+                prev = old.get(car_id)
+                moves.append({'car': car_id, 'from': self.slots[prev]['id'] if prev is not None else None,
+                              'to': self.slots[j]['id']})
+        return moves
+
+    def total_cost(self):
+        return sum(pair_cost(self.cars[car_id], self.slots[j], self.weights)
+                   for car_id, j in self.car_slot.items())
+
+    def snapshot(self):
+        """Current allocation as [{'car', 'slot'}], plus waiting car ids."""
+        return {
+            'assignments': [{'car': car_id, 'slot': self.slots[j]['id']} for car_id, j in self.car_slot.items()],
+            'waiting': [car['id'] for car in self.waiting],
+        }
+
+def _handle_safely(service, event):
+    """service.handle(event), or an error decision if the event is rejected."""
+    if not isinstance(event, dict):
+        return {'error': 'event must be a JSON object', 'event': event}
+    try:
+        return service.handle(event)
+    except KeyError as e:
+        key = e.args[0] if e.args else None
+        error = f'unknown car: {key}' if event.get('car_id') == key else f'missing field: {key}'
+        return {'error': error, 'event': event}
+    except (ValueError, TypeError, AttributeError) as e:
+        return {'error': str(e), 'event': event}
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--slots', required=True, help='slots JSON file')
+    parser.add_argument('--weights', help='optional JSON with weights')
+    args = parser.parse_args()
+
+    weights = load_json(args.weights) if args.weights else None
+    service = AllocationService(load_json(args.slots), weights)
+
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            event = json.loads(line)
+        except ValueError as e:
+            print(json.dumps({'error': f'invalid JSON: {e}', 'line': line}), flush=True)
+            continue
+        # A bad event (duplicate arrival, unknown car, ...) gets an error line; the service keeps running
+        for e in event if isinstance(event, list) else [event]:
+            print(json.dumps(_handle_safely(service, e)), flush=True)
+
+if __name__ == '__main__':
+    main()
@@ -3,50 +3,60 @@
 
 import streamlit as st
 import json
-import subprocess
 import pandas as pd
 from pathlib import Path
 from PIL import Image
 
+import agent
+from allocation_log import tail_rows
+
+ALLOCATIONS = Path('../allocations.csv')
+
 st.title('Smart Parking Allocation — Demo')
 
+@st.cache_data(max_entries=16)
+def parse_json(data):
+    return json.loads(data)
+
+@st.cache_data(max_entries=16)
+def solve(cars_data, slots_data, solver):
+    # Solved in-process and cached per input, so reruns and repeat clicks skip the solve
+    cars, slots = parse_json(cars_data), parse_json(slots_data)
+    return agent.solve(cars, slots, solver=solver)
+
 # Upload JSON files
 uploaded_cars = st.file_uploader('Upload vehicles JSON', type='json')
 uploaded_slots = st.file_uploader('Upload slots JSON', type='json')
+solver = st.sidebar.selectbox('Solver', ['dense', 'partitioned'])
 
 if uploaded_cars and uploaded_slots:
     # Load JSON
-    cars = json.load(uploaded_cars)
-    slots = json.load(uploaded_slots)
+    cars_data, slots_data = uploaded_cars.getvalue(), uploaded_slots.getvalue()
+    cars = parse_json(cars_data)
+    slots = parse_json(slots_data)
 
     # Show tables
     st.write('Vehicles:', pd.json_normalize(cars))
     st.write('Slots:', pd.json_normalize(slots))
 
     if st.button('Run allocation'):
-        # Save temp files
-        Path('temp_input_cars.json').write_text(json.dumps(cars))
-        Path('temp_input_slots.json').write_text(json.dumps(slots))
-
         # Run agent
-        cmd = [
-            'python',
-            '../agent/agent.py',
-            '--input', 'temp_input_cars.json',
-            '--slots', 'temp_input_slots.json',
-            '--out', '../allocations.csv'
-        ]
-        res = subprocess.run(cmd, capture_output=True, text=True)
+        assignments, total = solve(cars_data, slots_data, solver)
+        agent.save_allocations(assignments, cars, slots, str(ALLOCATIONS))
+        st.session_state['result'] = ((cars_data, slots_data, solver),
+                                      agent.summarize(assignments, cars, slots, total))
 
+    key, result = st.session_state.get('result', (None, None))
+    if key == (cars_data, slots_data, solver):
         # Show agent output
         st.text('Agent output:')
-        st.code(res.stdout)
+        st.code(json.dumps(result, indent=2))
 
         # Show latest allocations
-        allocations_file = Path('../allocations.csv')
-        if allocations_file.exists():
-            df = pd.read_csv(allocations_file)
-            st.dataframe(df.tail(20))
+        if ALLOCATIONS.exists():
+            header, rows = tail_rows(ALLOCATIONS, 20)
+            df = pd.DataFrame(rows, columns=header)
+            st.dataframe(df.astype({c: t for c, t in (('timestamp', int), ('cost', float)) if c in df}))
         else:
             st.write('No allocations file generated.')
 
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Vectorized energy allocation vs the per-hour linprog loop.
+
+Compares the per-hour objective (priority-weighted energy); allocations can
+differ between buildings whose priorities tie, at the same objective.
+
+Run:
+$ python benchmarks/bench_energy.py --buildings 2000 --hours 8760
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import numpy as np
+
+from energy_engine import allocate_greedy, allocate_linprog
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--buildings', type=int, default=2000)
+    parser.add_argument('--hours', type=int, default=8760)
+    parser.add_argument('--linprog-hours', type=int, default=48,
+                        help='hours to solve with linprog for the comparison (timing is extrapolated)')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    demand = rng.integers(50, 500, size=(args.buildings, args.hours))
+    priority = rng.integers(1, 5, size=args.buildings)
+    capacity = demand.sum(axis=0) * rng.uniform(0.3, 0.9, size=args.hours)
+
+    t0 = time.perf_counter()
+    fast = allocate_greedy(demand, priority, capacity)
+    t_fast = time.perf_counter() - t0
+    print(f'vectorized: {t_fast:8.3f}s for {args.buildings} buildings x {args.hours} hours')
+
+    h = min(args.linprog_hours, args.hours)
+    t0 = time.perf_counter()
+    ref = allocate_linprog(demand[:, :h], priority, capacity[:h])
+    t_ref = time.perf_counter() - t0
+    est = t_ref / h * args.hours
+    print(f'linprog:    {t_ref:8.3f}s for {h} hours (~{est:.1f}s extrapolated to {args.hours})')
+    obj_fast = priority @ fast[:, :h]
+    obj_ref = priority @ ref
+    gap = np.abs(obj_fast - obj_ref) / np.maximum(np.abs(obj_ref), 1.0)
+    print(f'objective:  max relative gap {gap.max():.3g} over {h} hours')
+    print(f'allocation: {np.mean(np.abs(fast[:, :h] - ref).max(axis=0) > 1e-6) * 100:.0f}% of hours '
+          f'differ (tied priorities; not an error)')
+    print(f'speedup:    ~{est / t_fast:.0f}x')
+
+if __name__ == '__main__':
+    main()
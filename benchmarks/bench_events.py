@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Event-driven per-vehicle traffic simulation throughput and delay distribution.
+
+Run:
+$ python benchmarks/bench_events.py --cycles 200000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Traffic controller'))
+
+from traffic_sim import TrafficSimulator
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--ns', type=float, default=12)
+    parser.add_argument('--ew', type=float, default=8)
+    parser.add_argument('--green-ns', type=float, default=15)
+    parser.add_argument('--green-ew', type=float, default=10)
+    parser.add_argument('--cycles', type=int, default=200000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    sim = TrafficSimulator(args.ns, args.ew, args.cycles)
+    t0 = time.perf_counter()
+    res = sim.run_events(args.green_ns, args.green_ew, args.seed)
+    elapsed = time.perf_counter() - t0
+
+    print(f'{res["events"]:,} events, {res["vehicles"]:,} vehicles in {elapsed:.2f}s '
+          f'({res["events"] / elapsed * 60 / 1e6:.1f}M events per minute)')
+    print(f'delay s: mean={res["mean_delay"]:.2f} p50={res["p50"]:.2f} p95={res["p95"]:.2f} p99={res["p99"]:.2f}')
+    print(f'throughput: {res["throughput_per_cycle"]:.2f} vehicles/cycle, unserved at end: {res["unserved"]}')
+
+if __name__ == '__main__':
+    main()
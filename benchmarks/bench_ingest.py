@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Bulk allocation-log ingestion vs the csv.DictReader loop in heatmap.load_counts.
+
+Generates a synthetic allocations log (kept for reuse) and times both readers.
+
+Run:
+$ python benchmarks/bench_ingest.py --rows 10000000 --workers 8
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from allocation_log import HEADER
+import heatmap
+
+def generate_log(path, rows, seed):
+    rng = random.Random(seed)
+    slot_ids = [f'{chr(ord("A") + r)}{c + 1}' for r in range(26) for c in range(200)]
+    sizes = ['small', 'medium', 'large']
+    ts = 1763660253
+    with open(path, 'w', newline='') as f:
+        f.write(','.join(HEADER) + '\n')
+        batch = []
+        for i in range(rows):
+            if i % 50 == 0:
+                ts += rng.randint(1, 120)
+            batch.append(f'{ts},car_{i},{rng.choice(sizes)},{rng.choice(slot_ids)},{rng.choice(sizes)},{rng.randint(-50, 50)}.0\n')
+            if len(batch) >= 100000:
+                f.writelines(batch)
+                batch.clear()
+        f.writelines(batch)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=10_000_000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--path', help='log file to use (generated if missing)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--skip-baseline', action='store_true', help='do not time the DictReader loop')
+    args = parser.parse_args()
+
+    path = args.path or f'bench_allocations_{args.rows}.csv'
+    if not os.path.exists(path):
+        t0 = time.perf_counter()
+        generate_log(path, args.rows, args.seed)
+        print(f'generated {path} ({os.path.getsize(path) / 1e6:.0f} MB) in {time.perf_counter() - t0:.1f}s')
+
+    t0 = time.perf_counter()
+    bulk = heatmap.load_counts_bulk(path, args.workers)
+    t_bulk = time.perf_counter() - t0
+    print(f'bulk ({args.workers} workers): {t_bulk:7.2f}s  rows={sum(bulk.values())}')
+
+    if args.skip_baseline:
+        return
+    t0 = time.perf_counter()
+    base = heatmap.load_counts(path)
+    t_base = time.perf_counter() - t0
+    print(f'DictReader:            {t_base:7.2f}s  rows={sum(base.values())}  match={base == bulk}')
+    print(f'speedup:               {t_base / t_bulk:7.1f}x')
+
+if __name__ == '__main__':
+    main()
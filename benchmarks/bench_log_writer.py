@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Allocation log writer: CSV vs Parquet vs Arrow IPC sinks.
+
+Writes the same rows through every sink, with string ids and with integer
+ids (what input_loader returns for integer JSON ids), checks that
+heatmap.load_counts reads back the same slot counts from each file, then
+prints write timings. Integer-id JSON loaded with input_loader is also
+written through agent.save_allocations into every sink.
+
+Run:
+$ python benchmarks/bench_log_writer.py --rows 1000000
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import agent
+from allocation_log import AllocationLogWriter
+import heatmap
+import input_loader
+
+FORMATS = ['csv', 'parquet', 'arrow']
+
+def make_rows(n, seed, int_ids):
+    rng = random.Random(seed)
+    sizes = ['small', 'medium', 'large']
+    rows = []
+    for i in range(n):
+        slot = rng.randrange(5000)
+        rows.append((1763660253 + i // 50, i if int_ids else f'car_{i}', rng.choice(sizes),
+                     slot if int_ids else f'S{slot}', rng.choice(sizes), float(rng.randint(-50, 50))))
+    return rows
+
+def check_loader_ids(tmp, n):
+    """Integer JSON ids -> input_loader tables -> save_allocations, once per sink."""
+    cars_path, slots_path = os.path.join(tmp, 'cars.json'), os.path.join(tmp, 'slots.json')
+    with open(cars_path, 'w') as f:
+        json.dump([{'id': i, 'size': 'small'} for i in range(n)], f)
+    with open(slots_path, 'w') as f:
+        json.dump([{'id': 10_000 + i, 'size': 'small', 'distance': i} for i in range(n)], f)
+    cars, slots = input_loader.load_vehicles(cars_path), input_loader.load_slots(slots_path)
+    assignments = [((i, i), 0.0) for i in range(n)]
+    expected = Counter(str(10_000 + i) for i in range(n))
+    failures = 0
+    for fmt in FORMATS:
+        path = os.path.join(tmp, f'loader.{fmt}')
+        agent.save_allocations(assignments, cars, slots, path)
+        match = heatmap.load_counts(path) == expected
+        failures += not match
+        print(f'input_loader ids, {fmt:8s}: match={match}')
+    return failures
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        for int_ids in (False, True):
+            rows = make_rows(args.rows, args.seed, int_ids)
+            expected = Counter(str(row[3]) for row in rows)
+            for fmt in FORMATS:
+                path = os.path.join(tmp, f'allocations_{"int" if int_ids else "str"}.{fmt}')
+                t0 = time.perf_counter()
+                with AllocationLogWriter(path) as log:
+                    log.write_rows(rows)
+                elapsed = time.perf_counter() - t0
+                match = heatmap.load_counts(path) == expected
+                failures += not match
+                print(f'{"int" if int_ids else "str"} ids, {fmt:8s}: {elapsed:7.2f}s  match={match}')
+        failures += check_loader_ids(tmp, 1000)
+    if failures:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
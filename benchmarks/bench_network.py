@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Network traffic simulation: single-run cost and parallel plan optimization.
+
+Run:
+$ python benchmarks/bench_network.py --rows 10 --cols 20 --workers 8
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Traffic controller'))
+
+import numpy as np
+
+from network_sim import Network, NetworkSimulator
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=10)
+    parser.add_argument('--cols', type=int, default=20)
+    parser.add_argument('--horizon', type=float, default=3600)
+    parser.add_argument('--iterations', type=int, default=5)
+    parser.add_argument('--candidates', type=int, default=8)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    sim = NetworkSimulator(Network.grid(args.rows, args.cols), horizon=args.horizon)
+    arrivals = sim.arrivals(args.seed)
+    n = sim.network.n_nodes
+
+    t0 = time.perf_counter()
+    base = sim.run(np.full(n, 0.5), np.zeros(n), arrivals)
+    t_run = time.perf_counter() - t0
+    print(f'{n} intersections, {args.horizon:.0f}s simulated: {t_run:.3f}s per run, '
+          f'delay {base["delay"]:,.0f} veh-s, throughput {base["throughput"]:,.0f}')
+
+    t0 = time.perf_counter()
+    splits, offsets, delay, evals = sim.optimize(args.iterations, args.candidates, args.workers,
+                                                 args.seed, arrivals)
+    elapsed = time.perf_counter() - t0
+    print(f'optimize: {evals} plans in {elapsed:.2f}s on {args.workers} workers, '
+          f'delay {base["delay"]:,.0f} -> {delay:,.0f} ({(1 - delay / base["delay"]) * 100:.1f}% lower)')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Dense vs size-partitioned parking assignment.
+
+Run:
+$ python benchmarks/bench_partitioned.py --cars 10000 --slots 50000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import numpy as np
+
+import agent
+from synth import make_cars, make_slots
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--cars', type=int, default=10000)
+    parser.add_argument('--slots', type=int, default=50000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--skip-dense', action='store_true',
+                        help='only time the partitioned solver (dense needs cars*slots*4 bytes)')
+    args = parser.parse_args()
+
+    cars = make_cars(args.cars, args.seed)
+    slots = make_slots(args.slots, args.seed)
+
+    t0 = time.perf_counter()
+    pairs, total = agent.assign_partitioned(cars, slots)
+    t_part = time.perf_counter() - t0
+    print(f'partitioned: {t_part:8.2f}s  assigned={len(pairs)}  total={total:.1f}')
+
+    if args.skip_dense:
+        return
+
+    print(f'dense matrix: {args.cars * args.slots * 4 / 1e9:.1f} GB (float32)')
+    t0 = time.perf_counter()
+    matrix = agent.build_cost_array(cars, slots, dtype=np.float32)
+    t_build = time.perf_counter() - t0
+    pairs_d, total_d = agent.assign_hungarian(matrix)
+    t_dense = time.perf_counter() - t0
+    print(f'dense:       {t_dense:8.2f}s  (build {t_build:.2f}s)  assigned={len(pairs_d)}  total={total_d:.1f}')
+    print(f'speedup:     {t_dense / t_part:8.1f}x')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Event-replay benchmark for the streaming allocation service.
+
+Generates a stream of arrivals and departures that keeps the garage around the
+target occupancy, replays it through AllocationService and reports per-event
+decision latency.
+
+Run:
+$ python benchmarks/bench_service.py --slots 50000 --events 200000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from allocation_service import AllocationService
+from synth import SIZES, make_slots
+
+def make_events(n_events, n_slots, occupancy, seed):
+    rng = random.Random(seed)
+    live = []
+    events = []
+    next_id = 0
+    for _ in range(n_events):
+        if live and (len(live) >= occupancy * n_slots or rng.random() < 0.4):
+            i = rng.randrange(len(live))
+            live[i], live[-1] = live[-1], live[i]
+            events.append({'type': 'depart', 'car_id': live.pop()})
+        else:
+            car = {'id': f'car_{next_id}', 'size': rng.choice(SIZES)}
+            next_id += 1
+            live.append(car['id'])
+            events.append({'type': 'arrive', 'car': car})
+    return events
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q / 100 * len(sorted_values)))]
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--slots', type=int, default=50000)
+    parser.add_argument('--events', type=int, default=200000)
+    parser.add_argument('--occupancy', type=float, default=0.95, help='target fraction of slots in use')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    service = AllocationService(make_slots(args.slots, args.seed))
+    events = make_events(args.events, args.slots, args.occupancy, args.seed)
+
+    latencies = {'arrive': [], 'depart': []}
+    start = time.perf_counter()
+    for event in events:
+        t0 = time.perf_counter()
+        service.handle(event)
+        latencies[event['type']].append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - start
+
+    print(f'{len(events)} events in {elapsed:.2f}s ({len(events) / elapsed:,.0f} events/s)')
+    for kind, values in latencies.items():
+        values.sort()
+        print(f'{kind:>7}: n={len(values):<8} p50={percentile(values, 50) * 1e6:8.1f}us  '
+              f'p99={percentile(values, 99) * 1e6:8.1f}us  max={values[-1] * 1e6 if values else 0:8.1f}us')
+
+if __name__ == '__main__':
+    main()
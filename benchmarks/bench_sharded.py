@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Sharded (per-lot, multi-process) allocation: scaling with workers and the
+gap vs a reference solve (dense, or size-partitioned on very large inputs).
+
+Run:
+$ python benchmarks/bench_sharded.py --cars 60000 --slots 70000 --lots 26 --workers 1,2,4,8
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import sharded
+from synth import make_cars, make_slots
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--cars', type=int, default=60000)
+    parser.add_argument('--slots', type=int, default=70000)
+    parser.add_argument('--lots', type=int, default=26, help='slot ID prefix letters (A..Z)')
+    parser.add_argument('--workers', default=f'1,{os.cpu_count()}', help='comma-separated worker counts')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    cars = make_cars(args.cars, args.seed)
+    slots = make_slots(args.slots, args.seed, rows=args.lots)
+    print(f'{args.cars} cars, {args.slots} slots in {args.lots} lots')
+
+    base = None
+    for workers in sorted({int(w) for w in args.workers.split(',')}):
+        t0 = time.perf_counter()
+        _, total = sharded.assign_sharded(cars, slots, workers=workers)
+        elapsed = time.perf_counter() - t0
+        base = base or elapsed
+        print(f'sharded, {workers:3d} workers: {elapsed:8.2f}s  speedup x{base / elapsed:5.2f}  total {total:,.0f}')
+
+    report = sharded.gap_report(cars, slots, workers=workers, sharded_total=total, sharded_seconds=elapsed)
+    label = report['reference_solver'] + ('' if report['reference_optimal'] else ', not the optimum')
+    print(f'reference ({label}): {report["reference_seconds"]:8.2f}s  '
+          f'total {report["reference_total"]:,.0f}  gap {report["gap"]:,.2f} ({report["gap_pct"]:.4f}%)')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Green-time search strategies vs the exhaustive grid.
+
+Each strategy runs on its own common-random-number traces; the configs they
+pick are then scored on a fresh, independent set of traces.
+
+Run:
+$ python benchmarks/bench_signal_search.py --ns 25 --ew 18 --max-green 60
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Traffic controller'))
+
+from traffic_sim import TrafficSimulator
+from signal_search import Evaluator
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--ns', type=float, default=25)
+    parser.add_argument('--ew', type=float, default=18)
+    parser.add_argument('--cycles', type=int, default=20)
+    parser.add_argument('--max-green', type=int, default=40)
+    parser.add_argument('--replications', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    sim = TrafficSimulator(args.ns, args.ew, args.cycles)
+    values = range(1, args.max_green + 1)
+    runs = {
+        'grid': {'ns_values': values, 'ew_values': values},
+        'halving': {'ns_values': values, 'ew_values': values},
+        'golden': {'bounds': ((1, args.max_green), (1, args.max_green))},
+    }
+    holdout = Evaluator(sim, args.replications, args.seed + 1)
+
+    print(f'{"strategy":>8} {"config":>16} {"wait":>9} {"holdout":>9} {"evaluations":>12} {"time":>8}')
+    for name, options in runs.items():
+        t0 = time.perf_counter()
+        config, wait, evals = sim.optimize_search(name, args.replications, args.seed, **options)
+        elapsed = time.perf_counter() - t0
+        check = holdout(*config)[0]
+        cfg = f'({config[0]:.1f}, {config[1]:.1f})'
+        print(f'{name:>8} {cfg:>16} {wait:9.3f} {check:9.3f} {evals:12,d} {elapsed:7.3f}s')
+
+if __name__ == '__main__':
+    main()
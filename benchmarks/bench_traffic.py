@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Scalar TrafficSimulator.run/optimize vs the vectorized Monte Carlo engine.
+
+Run:
+$ python benchmarks/bench_traffic.py --replications 2000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Traffic controller'))
+
+import numpy as np
+
+from traffic_sim import TrafficSimulator
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--ns', type=float, default=12)
+    parser.add_argument('--ew', type=float, default=8)
+    parser.add_argument('--cycles', type=int, default=20)
+    parser.add_argument('--replications', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    sim = TrafficSimulator(args.ns, args.ew, args.cycles)
+    np.random.seed(args.seed)
+
+    t0 = time.perf_counter()
+    sim.run(10, 10)
+    t_run = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    scalar_best, scalar_wait = sim.optimize()
+    t_opt = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    waits, _ = sim.run_batch(10, 10, args.replications, np.random.default_rng(args.seed))
+    t_batch_run = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    batch_best, batch_wait = sim.optimize_batch(args.replications, np.random.default_rng(args.seed))
+    t_batch_opt = time.perf_counter() - t0
+
+    per_rep = t_batch_run / args.replications
+    print(f'run():          {t_run * 1e3:8.3f} ms  (1 replication)')
+    print(f'run_batch():    {t_batch_run * 1e3:8.3f} ms  ({args.replications} replications, '
+          f'{t_run / per_rep:.0f}x per replication), mean wait {waits.mean():.2f}')
+    print(f'optimize():     {t_opt * 1e3:8.3f} ms  36 configs x 1 sample  -> {scalar_best} wait {scalar_wait:.2f}')
+    print(f'optimize_batch: {t_batch_opt * 1e3:8.3f} ms  36 configs x {args.replications} samples -> '
+          f'{batch_best} mean wait {batch_wait:.2f}')
+
+if __name__ == '__main__':
+    main()
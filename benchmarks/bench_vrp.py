@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Garbage routing: current nearest-first heuristic vs the VRP engine.
+
+The current heuristic (optimized_routes in app_garbage.py) visits bins sorted
+by distance from the depot; it is scored here on its visiting order with real
+shortest-path legs, which is the best case for it.
+
+Run:
+$ python benchmarks/bench_vrp.py --nodes 20000 --bins 500 --depots 3 --capacity 60
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'grabage collector'))
+
+import numpy as np
+
+from city_graph import random_city_graph
+import vrp
+
+def nearest_first_cost(problem):
+    """Cost of the current heuristic: one loop per depot over all bins, nearest-first."""
+    total = 0.0
+    bins = np.arange(problem.k, len(problem.stops))
+    for d in range(problem.k):
+        order = bins[np.argsort(problem.D[d, bins], kind='stable')]
+        total += problem.route_length(np.concatenate([[d], order, [d]]))
+    return total
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--nodes', type=int, default=20000)
+    parser.add_argument('--degree', type=float, default=4)
+    parser.add_argument('--bins', type=int, default=500)
+    parser.add_argument('--depots', type=int, default=3)
+    parser.add_argument('--capacity', type=float, default=60)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    graph = random_city_graph(args.nodes, seed=args.seed, degree=args.degree)
+    stops = rng.choice(args.nodes, args.depots + args.bins, replace=False)
+    depots, bins = stops[:args.depots], stops[args.depots:]
+
+    t0 = time.perf_counter()
+    problem = vrp.RoutingProblem(graph, depots, bins)
+    t_matrix = time.perf_counter() - t0
+    print(f'{args.nodes} nodes / {graph.n_edges} edges, {args.bins} bins, {args.depots} depots: '
+          f'distance matrix {t_matrix:.3f}s')
+    print(f'nearest-first (current): cost {nearest_first_cost(problem):,.0f} '
+          f'({args.depots} trucks, each visiting every bin)')
+
+    for construction in vrp.CONSTRUCTIONS:
+        for capacity in (None, args.capacity):
+            t0 = time.perf_counter()
+            res = vrp.solve(graph, depots, bins, capacity=capacity, construction=construction, problem=problem)
+            elapsed = time.perf_counter() - t0
+            label = 'unlimited' if capacity is None else f'{capacity:g}'
+            print(f'{construction:8s} capacity {label:9s}: {elapsed:.3f}s, cost {res["cost"]:,.0f}, '
+                  f'{len(res["routes"])} trucks')
+
+if __name__ == '__main__':
+    main()
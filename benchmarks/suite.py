@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite: every optimizer in the repo at several input sizes.
+
+Each case builds its synthetic input untimed, runs the operation once
+untimed as a warm-up (imports, lazy caches, first-call allocation), then
+`--repeat` times; the result records the best and median wall time and the
+peak traced memory (tracemalloc, a separate untimed run, covers Python and
+NumPy allocations). Results are written as JSON and can be compared with a
+stored baseline: a case is a regression when its best time exceeds the
+baseline's by more than `--tolerance` (exit status 1).
+
+Cases:
+- agent          build_cost_matrix + assign_hungarian
+- heatmap        heatmap.load_counts on a synthetic allocations log
+- energy         hourly linprog loop (allocate_linprog) and run_simulation
+- traffic        TrafficSimulator.run and .optimize
+- garbage        dijkstra (CityGraph adapter used by app_garbage.py) and the
+                 VRP solve behind optimized_routes (app_garbage.py itself is
+                 a Streamlit page and cannot be imported)
+
+Baselines are machine-specific, so none is committed. Record one on the
+machine that runs the check, from the commit to compare against, then
+compare later runs with it:
+$ git checkout main && python benchmarks/suite.py --out /tmp/baseline.json
+$ git checkout my-branch && python benchmarks/suite.py --baseline /tmp/baseline.json --tolerance 0.25
+
+Run:
+$ python benchmarks/suite.py --sizes small,medium --out bench.json
+$ python benchmarks/suite.py --cases "traffic.*" --profile profiles/
+
+--profile writes one cProfile .prof per case (open with snakeviz, or turn
+into a flamegraph with flameprof).
+"""
+
+import argparse
+import cProfile
+import fnmatch
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'Traffic controller'))
+sys.path.insert(0, os.path.join(ROOT, 'grabage collector'))
+
+import numpy as np
+
+from synth import make_cars, make_slots
+
+SIZES = ('small', 'medium', 'large')
+
+# ----------------------------------------
+# CASES: name -> {size: setup() -> zero-argument callable}
+# ----------------------------------------
+def agent_dense(n):
+    def setup():
+        import agent
+        cars, slots = make_cars(n), make_slots(int(n * 1.2))
+        return lambda: agent.assign_hungarian(agent.build_cost_matrix(cars, slots))
+    return setup
+
+def heatmap_counts(rows):
+    def setup():
+        import heatmap
+        from bench_ingest import generate_log
+        path = os.path.join(tempfile.gettempdir(), f'suite_allocations_{rows}.csv')
+        if not os.path.exists(path):
+            generate_log(path, rows, seed=0)
+        return lambda: heatmap.load_counts(path)
+    return setup
+
+def _energy_inputs(buildings, hours):
+    rng = np.random.default_rng(42)
+    demand = rng.integers(50, 500, size=(buildings, hours))
+    priority = rng.integers(1, 5, size=buildings)
+    capacity = demand.sum(axis=0) * rng.uniform(0.3, 0.9, size=hours)
+    return demand, priority, capacity
+
+def energy_linprog(buildings, hours):
+    def setup():
+        from energy_engine import allocate_linprog
+        demand, priority, capacity = _energy_inputs(buildings, hours)
+        return lambda: allocate_linprog(demand, priority, capacity)
+    return setup
+
+def energy_simulation(buildings, hours):
+    def setup():
+        from energy_engine import run_simulation
+        return lambda: run_simulation(buildings, buildings * 150, hours=hours)
+    return setup
+
+def traffic_run(cycles):
+    def setup():
+        from traffic_sim import TrafficSimulator
+        sim = TrafficSimulator(12, 8, cycles)
+        return lambda: sim.run(15, 10)
+    return setup
+
+def traffic_optimize(cycles):
+    def setup():
+        from traffic_sim import TrafficSimulator
+        sim = TrafficSimulator(12, 8, cycles)
+        return sim.optimize
+    return setup
+
+def _city(nodes, stops):
+    from city_graph import random_city_graph
+    graph = random_city_graph(nodes, seed=1, degree=4)
+    chosen = np.random.default_rng(0).choice(nodes, stops, replace=False)
+    return graph, chosen
+
+def garbage_dijkstra(nodes):
+    def setup():
+        graph, chosen = _city(nodes, 1)
+        return lambda: graph.dijkstra(int(chosen[0]))
+    return setup
+
+def garbage_routes(nodes, bins, depots=2):
+    def setup():
+        import vrp
+        graph, chosen = _city(nodes, bins + depots)
+        return lambda: vrp.solve(graph, chosen[:depots], chosen[depots:], capacity=max(1, bins // 5))
+    return setup
+
+CASES = {
+    'agent.dense':        {'small': agent_dense(100), 'medium': agent_dense(400), 'large': agent_dense(1000)},
+    'heatmap.load_counts': {'small': heatmap_counts(10_000), 'medium': heatmap_counts(200_000),
+                            'large': heatmap_counts(2_000_000)},
+    'energy.linprog':     {'small': energy_linprog(10, 24), 'medium': energy_linprog(100, 168),
+                           'large': energy_linprog(500, 720)},
+    'energy.simulation':  {'small': energy_simulation(10, 24), 'medium': energy_simulation(1000, 168),
+                           'large': energy_simulation(5000, 8760)},
+    'traffic.run':        {'small': traffic_run(20), 'medium': traffic_run(2000), 'large': traffic_run(100_000)},
+    'traffic.optimize':   {'small': traffic_optimize(20), 'medium': traffic_optimize(200),
+                           'large': traffic_optimize(2000)},
+    'garbage.dijkstra':   {'small': garbage_dijkstra(1000), 'medium': garbage_dijkstra(20_000),
+                           'large': garbage_dijkstra(200_000)},
+    'garbage.routes':     {'small': garbage_routes(1000, 20), 'medium': garbage_routes(5000, 200),
+                           'large': garbage_routes(20_000, 500)},
+}
+
+# ----------------------------------------
+# RUNNER
+# ----------------------------------------
+def measure(fn, repeat):
+    fn()   # warm-up, so one-off import / cache costs are not timed
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {'best_s': min(times), 'median_s': statistics.median(times), 'peak_bytes': peak, 'repeat': repeat}
+
+def profile(fn, path):
+    prof = cProfile.Profile()
+    prof.runcall(fn)
+    prof.dump_stats(path)
+
+def compare(results, baseline, tolerance, min_delta=1e-3):
+    """Rows (key, baseline_s, current_s, ratio, regressed) for cases present in both.
+    Slowdowns under min_delta seconds are timer noise and never count as regressions."""
+    rows = []
+    for key, res in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        ratio = res['best_s'] / base['best_s'] if base['best_s'] else float('inf')
+        regressed = ratio > 1 + tolerance and res['best_s'] - base['best_s'] > min_delta
+        rows.append((key, base['best_s'], res['best_s'], ratio, regressed))
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--cases', default='*', help='comma-separated case names or globs (e.g. "agent.*,traffic.run")')
+    parser.add_argument('--sizes', default='small,medium', help=f'comma-separated subset of {",".join(SIZES)}')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--out', help='write results JSON here')
+    parser.add_argument('--baseline', help='results JSON to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='allowed slowdown vs baseline (0.2 = 20%%)')
+    parser.add_argument('--profile', metavar='DIR', help='dump a cProfile .prof per case into DIR')
+    args = parser.parse_args()
+
+    if args.baseline and not os.path.exists(args.baseline):
+        parser.error(f'baseline {args.baseline} not found; record one with --out first (see the module docstring)')
+
+    patterns = args.cases.split(',')
+    sizes = args.sizes.split(',')
+    if args.profile:
+        os.makedirs(args.profile, exist_ok=True)
+
+    results = {}
+    for name, by_size in CASES.items():
+        if not any(fnmatch.fnmatch(name, p) for p in patterns):
+            continue
+        for size in sizes:
+            fn = by_size[size]()
+            key = f'{name}[{size}]'
+            results[key] = measure(fn, args.repeat)
+            if args.profile:
+                profile(fn, os.path.join(args.profile, f'{key}.prof'))
+            r = results[key]
+            print(f'{key:32s} best {r["best_s"]:9.4f}s  median {r["median_s"]:9.4f}s  '
+                  f'peak {r["peak_bytes"] / 1e6:9.1f} MB', flush=True)
+
+    report = {
+        'meta': {'python': platform.python_version(), 'numpy': np.__version__,
+                 'machine': platform.machine(), 'timestamp': int(time.time())},
+        'results': results,
+    }
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+        rows = compare(results, baseline, args.tolerance)
+        regressions = [r for r in rows if r[4]]
+        for key, base, cur, ratio, regressed in rows:
+            print(f'{key:32s} {base:9.4f}s -> {cur:9.4f}s  x{ratio:5.2f}{"  REGRESSION" if regressed else ""}')
+        if regressions:
+            print(f'{len(regressions)} regression(s) beyond {args.tolerance:.0%}')
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
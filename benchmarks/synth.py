@@ -0,0 +1,26 @@
+"""
+Synthetic input generators shared by the benchmark scripts.
+"""
+
+import random
+
+SIZES = ['small', 'medium', 'large']
+
+def make_cars(n, seed=0):
+    rng = random.Random(seed)
+    return [{'id': f'car_{i}', 'size': rng.choice(SIZES)} for i in range(n)]
+
+def make_slots(n, seed=0, rows=26):
+    """Slots named like the sample data ('A1', 'B7', ...), spread over `rows` lots."""
+    rng = random.Random(seed + 1)
+    per_row = -(-n // rows)
+    slots = []
+    for i in range(n):
+        row, col = divmod(i, per_row)
+        slots.append({
+            'id': f'{chr(ord("A") + row)}{col + 1}',
+            'size': rng.choice(SIZES),
+            'distance': rng.randint(1, 50),
+            'priority': rng.randint(0, 5),
+        })
+    return slots
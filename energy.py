@@ -1,11 +1,9 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-from scipy.optimize import linprog
-from fpdf import FPDF
-import matplotlib.pyplot as plt
+from energy_engine import run_simulation
+from energy_report import generate_pdf
 
 st.set_page_config(page_title="Advanced Energy Distribution", layout="wide")
 st.title("Advanced Energy Distribution Agents")
@@ -16,15 +14,58 @@ st.markdown("Dynamic 24-hour energy allocation simulation for multiple buildings
 # ------------------------
 num_buildings = st.sidebar.number_input("Number of buildings", 5, 50, 10)
 total_energy_per_hour = st.sidebar.number_input("Total energy available per hour (kWh)", 500, 10000, 3000)
+seed = st.sidebar.number_input("Random seed", 0, 10000, 42)
 hours = 24
 
+st.sidebar.subheader("Multi-period constraints")
+couple_hours = st.sidebar.checkbox("Couple hours (storage, ramp limits, daily caps)", False)
+constraints = None
+if couple_hours:
+    battery_kwh = st.sidebar.number_input("Battery capacity (kWh)", 0, 50000, 5000)
+    ramp_limit = st.sidebar.number_input("Ramp limit per building (kWh/h)", 10, 1000, 150,
+                                         help="Largest hour-to-hour change, up or down")
+    daily_cap = st.sidebar.number_input("Daily cap per building (kWh)", 100, 20000, 5000)
+    # Tuple so it can be part of the cache key
+    constraints = (('battery_kwh', battery_kwh), ('ramp', ramp_limit), ('daily_cap', daily_cap))
+
+# Simulation, allocation and figures are memoized on the inputs that affect them,
+# so widget changes that don't alter those inputs skip the solve and chart rebuild.
+@st.cache_data(max_entries=64, show_spinner=False)
+def cached_simulation(num_buildings, total_energy_per_hour, seed, constraints):
+    return run_simulation(num_buildings, total_energy_per_hour, seed, hours,
+                          dict(constraints) if constraints else None)
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def efficiency_figure(num_buildings, total_energy_per_hour, seed, constraints):
+    result = cached_simulation(num_buildings, total_energy_per_hour, seed, constraints)
+    return px.imshow(result['efficiency'],
+                     labels=dict(x="Hour", y="Building", color="Efficiency (%)"),
+                     x=[f"Hour {h}" for h in range(1, hours+1)],
+                     y=result['buildings'],
+                     color_continuous_scale='Viridis')
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def allocation_figure(num_buildings, total_energy_per_hour, seed, constraints):
+    result = cached_simulation(num_buildings, total_energy_per_hour, seed, constraints)
+    fig = go.Figure()
+    for i, b in enumerate(result['buildings']):
+        fig.add_trace(go.Bar(
+            x=[f"Hour {h}" for h in range(1, hours+1)],
+            y=result['allocations'][i],
+            name=b
+        ))
+    fig.update_layout(barmode='stack', title="Energy Allocation per Hour")
+    return fig
+
+key = (num_buildings, total_energy_per_hour, seed, constraints)
+
 # ------------------------
 # 2. Simulate Building Demand
 # ------------------------
-np.random.seed(42)
-demand = np.random.randint(50, 500, size=(num_buildings, hours))
-priority = np.random.randint(1, 5, size=num_buildings)  # 1 = high, 5 = low
-buildings = [f"Building {i+1}" for i in range(num_buildings)]
+result = cached_simulation(*key)
+demand = result['demand']
+priority = result['priority']
+buildings = result['buildings']
 
 df_demand = pd.DataFrame(demand, columns=[f"Hour {h}" for h in range(1, hours+1)])
 df_demand['Building'] = buildings
@@ -35,86 +76,36 @@ st.dataframe(df_demand)
 # ------------------------
 # 3. Optimization Allocation
 # ------------------------
-allocations = []
-
-for h in range(hours):
-    c = -priority  # maximize priority-weighted allocation
-    A = [np.ones(num_buildings)]
-    b = [total_energy_per_hour]
-    bounds = [(0, demand[i, h]) for i in range(num_buildings)]
-    res = linprog(c, A_ub=A, b_ub=b, bounds=bounds, method='highs')
-    allocations.append(res.x)
-
-allocations = np.array(allocations).T  # shape: buildings x hours
-
-# Efficiency calculation
-efficiency = allocations / demand * 100
+# Solved inside run_simulation: vectorized per-hour allocation, or one sparse LP
+# over the whole day when hours are coupled
+allocations = result['allocations']
+efficiency = result['efficiency']
 
 # ------------------------
 # 4. Interactive Heatmap
 # ------------------------
 st.subheader("Efficiency Heatmap (%)")
-fig_heatmap = px.imshow(efficiency,
-                        labels=dict(x="Hour", y="Building", color="Efficiency (%)"),
-                        x=[f"Hour {h}" for h in range(1, hours+1)],
-                        y=buildings,
-                        color_continuous_scale='Viridis')
-st.plotly_chart(fig_heatmap, use_container_width=True)
+st.plotly_chart(efficiency_figure(*key), use_container_width=True)
 
 # ------------------------
 # 5. Stacked Bar Chart per Hour
 # ------------------------
 st.subheader("Hourly Energy Allocation (Stacked)")
-fig_bar = go.Figure()
-for i, b in enumerate(buildings):
-    fig_bar.add_trace(go.Bar(
-        x=[f"Hour {h}" for h in range(1, hours+1)],
-        y=allocations[i],
-        name=b
-    ))
-fig_bar.update_layout(barmode='stack', title="Energy Allocation per Hour")
-st.plotly_chart(fig_bar, use_container_width=True)
+st.plotly_chart(allocation_figure(*key), use_container_width=True)
 
 # ------------------------
 # 6. PDF Report Generation
 # ------------------------
 st.subheader("Download PDF Report")
 
-def generate_pdf(buildings, demand, allocations, efficiency):
-    pdf = FPDF()
-    pdf.add_page()
-    pdf.set_font("Arial", "B", 16)
-    pdf.cell(0, 10, "Advanced Energy Distribution Report", ln=True, align="C")
-    pdf.ln(10)
-    pdf.set_font("Arial", "", 12)
-    
-    # Add summary table
-    for i, b in enumerate(buildings):
-        total_demand = int(demand[i].sum())
-        total_alloc = int(allocations[i].sum())
-        avg_eff = round(efficiency[i].mean(), 2)
-        pdf.cell(0, 8, f"{b}: Total Demand={total_demand} kWh, Allocated={total_alloc} kWh, Avg Efficiency={avg_eff}%", ln=True)
-    
-    # Add heatmap image
-    plt.figure(figsize=(10,5))
-    plt.imshow(efficiency, aspect='auto', cmap='viridis', origin='lower')
-    plt.colorbar(label='Efficiency (%)')
-    plt.xticks(ticks=np.arange(hours), labels=[f"{h}" for h in range(1, hours+1)])
-    plt.yticks(ticks=np.arange(len(buildings)), labels=buildings)
-    plt.title("Efficiency Heatmap (%)")
-    plt.tight_layout()
-    heatmap_file = "heatmap.png"
-    plt.savefig(heatmap_file)
-    plt.close()
-    pdf.image(heatmap_file, x=10, y=80, w=190)
-    
-    file_name = "Advanced_Energy_Report.pdf"
-    pdf.output(file_name)
-    return file_name
+@st.cache_data(max_entries=16, show_spinner=False)
+def cached_report(num_buildings, total_energy_per_hour, seed, constraints):
+    # Built in memory and returned as bytes, so concurrent sessions never share files
+    result = cached_simulation(num_buildings, total_energy_per_hour, seed, constraints)
+    return generate_pdf(result['buildings'], result['demand'], result['allocations'], result['efficiency'])
 
 if st.button("Generate PDF Report"):
-    pdf_file = generate_pdf(buildings, demand, allocations, efficiency)
-    with open(pdf_file, "rb") as f:
-        st.download_button("Download PDF", f, file_name=pdf_file, mime="application/pdf")
+    st.download_button("Download PDF", cached_report(*key),
+                       file_name="Advanced_Energy_Report.pdf", mime="application/pdf")
 
 st.success("Simulation complete! You can explore charts and download the PDF report.")
@@ -0,0 +1,348 @@
+"""
+Energy Allocation Engine
+
+Each hour is a fractional knapsack: maximize sum(priority * x) subject to
+sum(x) <= capacity and 0 <= x <= demand. Filling buildings in priority order
+solves it exactly, so all hours for all buildings are solved at once with a
+sort and a cumulative sum over the (buildings x hours) demand matrix.
+
+Ties between equal priorities are filled from the highest building index
+down, which is usually the order HiGHS picks. The per-hour linprog loop
+(see allocate_linprog) reaches the same objective, but when priorities tie
+it can split the energy between the tied buildings differently.
+"""
+
+import numpy as np
+from scipy import sparse
+
+def priority_order(priority):
+    """Fill order: highest priority first, equal priorities by descending index."""
+    priority = np.asarray(priority)
+    return np.lexsort((-np.arange(len(priority)), -priority))
+
+def allocate_greedy(demand, priority, capacity):
+    """Allocate energy for every building and hour in one vectorized pass.
+
+    demand: (buildings, hours) array; priority: (buildings,) weights (higher wins);
+    capacity: scalar or (hours,) energy available per hour.
+    Returns a float64 (buildings, hours) allocation matrix. It has the optimal
+    objective each hour; among tied priorities it is one of several optima.
+    """
+    demand = np.asarray(demand, dtype=np.float64)
+    capacity = np.broadcast_to(np.asarray(capacity, dtype=np.float64), demand.shape[1:])
+    order = priority_order(priority)
+
+    sorted_demand = demand[order]
+    filled_before = np.cumsum(sorted_demand, axis=0)
+    filled_before -= sorted_demand
+    remaining = capacity - filled_before
+    np.clip(remaining, 0.0, sorted_demand, out=remaining)
+
+    allocations = np.empty_like(demand)
+    allocations[order] = remaining
+    return allocations
+
+def simulate_demand(num_buildings, hours=24, seed=42):
+    """Random hourly demand (kWh) and priorities; same draws as np.random.seed(seed)."""
+    rng = np.random.RandomState(seed)
+    demand = rng.randint(50, 500, size=(num_buildings, hours))
+    priority = rng.randint(1, 5, size=num_buildings)  # 1 = high, 5 = low
+    return demand, priority
+
+def run_simulation(num_buildings, total_energy_per_hour, seed=42, hours=24, constraints=None):
+    """Simulate demand and allocate it. Pure function of its arguments (no UI, no files).
+
+    constraints: None for independent hours, or {'battery_kwh', 'ramp', 'daily_cap'}
+    to solve the coupled multi-period LP; 'ramp' limits hour-to-hour increases
+    and decreases alike.
+    Returns {'buildings', 'demand', 'priority', 'allocations', 'efficiency'}.
+    """
+    demand, priority = simulate_demand(num_buildings, hours, seed)
+    if constraints:
+        battery_kwh = constraints['battery_kwh']
+        storage = {'capacity': battery_kwh, 'charge_rate': battery_kwh / 4,
+                   'discharge_rate': battery_kwh / 4, 'efficiency': 0.9, 'initial': 0.0}
+        allocations = allocate_horizon(demand, priority, total_energy_per_hour, storage=storage,
+                                       ramp=constraints['ramp'], ramp_down=constraints['ramp'],
+                                       daily_cap=constraints['daily_cap'])['allocations']
+    else:
+        allocations = allocate_greedy(demand, priority, total_energy_per_hour)
+    return {
+        'buildings': [f"Building {i+1}" for i in range(num_buildings)],
+        'demand': demand,
+        'priority': priority,
+        'allocations': allocations,
+        'efficiency': allocations / demand * 100,
+    }
+
+def allocate_linprog(demand, priority, capacity):
+    """Reference implementation: one scipy linprog (HiGHS) call per hour."""
+    from scipy.optimize import linprog
+
+    demand = np.asarray(demand)
+    num_buildings, hours = demand.shape
+    capacity = np.broadcast_to(np.asarray(capacity, dtype=np.float64), (hours,))
+    allocations = []
+    for h in range(hours):
+        c = -np.asarray(priority)  # maximize priority-weighted allocation
+        A = [np.ones(num_buildings)]
+        b = [capacity[h]]
+        bounds = [(0, demand[i, h]) for i in range(num_buildings)]
+        res = linprog(c, A_ub=A, b_ub=b, bounds=bounds, method='highs')
+        allocations.append(res.x)
+    return np.array(allocations).T  # shape: buildings x hours
+
+# ------------------------
+# Multi-period allocation (storage, ramp limits, daily caps)
+# ------------------------
+try:
+    import highspy
+    HIGHSPY_AVAILABLE = True
+except Exception:
+    HIGHSPY_AVAILABLE = False
+
+def _per_building(value, num_buildings):
+    return np.broadcast_to(np.asarray(value, dtype=np.float64), (num_buildings,))
+
+def build_horizon_lp(demand, priority, capacity, storage=None, ramp=None, ramp_down=None,
+                     daily_cap=None, hour_offset=0, state=None):
+    """Formulate a whole horizon as one sparse LP (minimize -priority * x).
+
+    Variables: x[i, t] for every building/hour (index i * hours + t), then, with
+    storage, charge c[t], discharge d[t] and state of charge s[t].
+    Constraints (A_ub):
+      supply       sum_i x[i, t] + c[t] - d[t] <= capacity[t]
+      ramp up      x[i, t] - x[i, t-1] <= ramp[i]
+      ramp down    x[i, t-1] - x[i, t] <= ramp_down[i]   (can be infeasible if demand collapses)
+      daily cap    sum of x[i, t] over each calendar day <= daily_cap[i]
+    (A_eq) s[t] - s[t-1] - efficiency * c[t] + d[t] = 0.
+
+    storage: {'capacity', 'charge_rate', 'discharge_rate', 'efficiency', 'initial'} (kWh / kWh per hour).
+    hour_offset is the absolute hour of column 0, used for day boundaries; state carries
+    {'prev', 'soc', 'used_today'} from already committed hours.
+    Daily-cap rows are indexed by absolute day modulo the row count, so consecutive
+    windows of the same length share one matrix layout.
+    """
+    demand = np.asarray(demand, dtype=np.float64)
+    priority = np.asarray(priority, dtype=np.float64)
+    num_buildings, hours = demand.shape
+    capacity = np.broadcast_to(np.asarray(capacity, dtype=np.float64), (hours,))
+    state = state or {}
+    n_x = num_buildings * hours
+    n_vars = n_x + (3 * hours if storage else 0)
+    b_idx = np.repeat(np.arange(num_buildings), hours)
+    t_idx = np.tile(np.arange(hours), num_buildings)
+    x_col = np.arange(n_x)
+
+    rows, cols, vals, rhs = [], [], [], []
+    blocks = {}
+    n_rows = 0
+
+    def add_block(name, r, c, v, b):
+        nonlocal n_rows
+        rows.append(r + n_rows)
+        cols.append(c)
+        vals.append(v)
+        rhs.append(b)
+        blocks[name] = n_rows
+        n_rows += len(b)
+
+    # Supply per hour
+    r, c, v = [t_idx], [x_col], [np.ones(n_x)]
+    if storage:
+        h = np.arange(hours)
+        r += [h, h]
+        c += [n_x + h, n_x + hours + h]
+        v += [np.ones(hours), -np.ones(hours)]
+    add_block('supply', np.concatenate(r), np.concatenate(c), np.concatenate(v), capacity.copy())
+
+    prev = state.get('prev')
+    for name, limit, sign in (('ramp_up', ramp, 1.0), ('ramp_down', ramp_down, -1.0)):
+        if limit is None:
+            continue
+        limit = _per_building(limit, num_buildings)
+        later = t_idx > 0
+        r = np.concatenate([x_col, x_col[later]])
+        c = np.concatenate([x_col, x_col[later] - 1])
+        v = np.concatenate([np.full(n_x, sign), np.full(int(later.sum()), -sign)])
+        b = np.repeat(limit, hours)
+        # First hour ramps from the last committed allocation (unconstrained without one)
+        first = np.arange(num_buildings) * hours
+        if prev is None:
+            b[first] = demand[:, 0] + limit if sign > 0 else limit
+        else:
+            b[first] = limit + sign * np.asarray(prev, dtype=np.float64)
+        add_block(name, r, c, v, b)
+
+    day_slots = 0
+    if daily_cap is not None:
+        cap = _per_building(daily_cap, num_buildings)
+        day_slots = (hours + 22) // 24 + 1
+        day = (hour_offset + t_idx) // 24
+        r = b_idx * day_slots + day % day_slots
+        b = np.repeat(cap, day_slots)
+        used = state.get('used_today')
+        if used is not None:
+            today = hour_offset // 24
+            b[np.arange(num_buildings) * day_slots + today % day_slots] -= np.asarray(used, dtype=np.float64)
+        add_block('daily_cap', r, x_col, np.ones(n_x), np.maximum(b, 0.0))
+
+    A_ub = sparse.csr_matrix((np.concatenate(vals), (np.concatenate(rows), np.concatenate(cols))),
+                             shape=(n_rows, n_vars))
+    b_ub = np.concatenate(rhs)
+
+    lb = np.zeros(n_vars)
+    ub = np.empty(n_vars)
+    ub[:n_x] = demand.ravel()
+    A_eq = b_eq = None
+    if storage:
+        eff = storage.get('efficiency', 1.0)
+        h = np.arange(hours)
+        c_col, d_col, s_col = n_x + h, n_x + hours + h, n_x + 2 * hours + h
+        r = np.concatenate([h, h[1:], h, h])
+        c = np.concatenate([s_col, s_col[:-1], c_col, d_col])
+        v = np.concatenate([np.ones(hours), -np.ones(hours - 1), np.full(hours, -eff), np.ones(hours)])
+        A_eq = sparse.csr_matrix((v, (r, c)), shape=(hours, n_vars))
+        b_eq = np.zeros(hours)
+        b_eq[0] = state.get('soc', storage.get('initial', 0.0))
+        ub[c_col] = storage.get('charge_rate', np.inf)
+        ub[d_col] = storage.get('discharge_rate', np.inf)
+        ub[s_col] = storage['capacity']
+
+    cost = np.zeros(n_vars)
+    cost[:n_x] = -np.repeat(priority, hours)
+    return {
+        'c': cost, 'A_ub': A_ub, 'b_ub': b_ub, 'A_eq': A_eq, 'b_eq': b_eq,
+        'lb': lb, 'ub': ub, 'shape': (num_buildings, hours), 'blocks': blocks,
+        'day_slots': day_slots, 'storage': bool(storage),
+    }
+
+def _unpack(lp, x):
+    num_buildings, hours = lp['shape']
+    n_x = num_buildings * hours
+    out = {'allocations': x[:n_x].reshape(num_buildings, hours)}
+    if lp['storage']:
+        out['charge'] = x[n_x:n_x + hours]
+        out['discharge'] = x[n_x + hours:n_x + 2 * hours]
+        out['soc'] = x[n_x + 2 * hours:]
+    return out
+
+def _solve_linprog(lp):
+    from scipy.optimize import linprog
+
+    res = linprog(lp['c'], A_ub=lp['A_ub'], b_ub=lp['b_ub'], A_eq=lp['A_eq'], b_eq=lp['b_eq'],
+                  bounds=np.column_stack([lp['lb'], lp['ub']]), method='highs')
+    if res.status != 0:
+        raise ValueError(f'multi-period allocation failed: {res.message}')
+    out = _unpack(lp, res.x)
+    out['objective'] = -res.fun
+    return out
+
+def allocate_horizon(demand, priority, capacity, storage=None, ramp=None, ramp_down=None,
+                     daily_cap=None, hour_offset=0, state=None):
+    """Solve the whole horizon at once with the coupling constraints of build_horizon_lp.
+    Returns {'allocations', 'objective'} plus 'charge', 'discharge', 'soc' with storage.
+    """
+    lp = build_horizon_lp(demand, priority, capacity, storage, ramp, ramp_down,
+                          daily_cap, hour_offset, state)
+    return _solve_linprog(lp)
+
+class RollingPlanner:
+    """Rolling-horizon re-planning: each step plans `window` hours ahead and commits the first.
+
+    Every window has the same LP layout, so with highspy installed the model is built
+    once and each step only changes bounds, right-hand sides and the few daily-cap
+    coefficients that cross midnight; HiGHS then re-solves from the previous basis.
+    Without highspy each step is a cold scipy linprog solve.
+    """
+
+    def __init__(self, priority, window=24, storage=None, ramp=None, ramp_down=None,
+                 daily_cap=None, hour=0):
+        self.priority = np.asarray(priority, dtype=np.float64)
+        self.window = window
+        self.storage = storage
+        self.ramp = ramp
+        self.ramp_down = ramp_down
+        self.daily_cap = daily_cap
+        self.hour = hour
+        self.state = {'soc': storage.get('initial', 0.0)} if storage else {}
+        if daily_cap is not None:
+            self.state['used_today'] = np.zeros(len(self.priority))
+        self._highs = None
+        self._lp = None
+
+    def _build(self, demand, capacity):
+        return build_horizon_lp(demand, self.priority, capacity, self.storage, self.ramp,
+                                self.ramp_down, self.daily_cap, self.hour, self.state)
+
+    def _solve_highs(self, lp):
+        A = lp['A_ub'] if lp['A_eq'] is None else sparse.vstack([lp['A_ub'], lp['A_eq']])
+        row_lower = np.full(A.shape[0], -highspy.kHighsInf)
+        row_upper = np.concatenate([lp['b_ub']] + ([lp['b_eq']] if lp['A_eq'] is not None else []))
+        if lp['A_eq'] is not None:
+            row_lower[-len(lp['b_eq']):] = lp['b_eq']
+
+        if self._highs is None or self._lp['A_ub'].shape != lp['A_ub'].shape:
+            A = A.tocsc()
+            model = highspy.HighsLp()
+            model.num_col_ = A.shape[1]
+            model.num_row_ = A.shape[0]
+            model.col_cost_ = lp['c']
+            model.col_lower_ = lp['lb']
+            model.col_upper_ = lp['ub']
+            model.row_lower_ = row_lower
+            model.row_upper_ = row_upper
+            model.a_matrix_.format_ = highspy.MatrixFormat.kColwise
+            model.a_matrix_.start_ = A.indptr
+            model.a_matrix_.index_ = A.indices
+            model.a_matrix_.value_ = A.data
+            self._highs = highspy.Highs()
+            self._highs.setOptionValue('output_flag', False)
+            self._highs.passModel(model)
+        else:
+            h = self._highs
+            cols = np.arange(len(lp['lb']), dtype=np.int32)
+            rows = np.arange(len(row_lower), dtype=np.int32)
+            h.changeColsBounds(len(cols), cols, lp['lb'], lp['ub'])
+            h.changeRowsBounds(len(rows), rows, row_lower, row_upper)
+            if lp['day_slots']:
+                # Columns whose calendar day changed move to another daily-cap row
+                start = lp['blocks']['daily_cap']
+                stop = start + len(self.priority) * lp['day_slots']
+                n_x = lp['shape'][0] * lp['shape'][1]
+                old_rows = self._lp['A_ub'][start:stop].tocsc().indices[:n_x]
+                new_rows = lp['A_ub'][start:stop].tocsc().indices[:n_x]
+                for col in np.flatnonzero(old_rows != new_rows):
+                    h.changeCoeff(int(start + old_rows[col]), int(col), 0.0)
+                    h.changeCoeff(int(start + new_rows[col]), int(col), 1.0)
+        self._lp = lp
+
+        self._highs.run()
+        if self._highs.getModelStatus() != highspy.HighsModelStatus.kOptimal:
+            raise ValueError(f'multi-period allocation failed: {self._highs.modelStatusToString(self._highs.getModelStatus())}')
+        x = np.asarray(self._highs.getSolution().col_value)
+        out = _unpack(lp, x)
+        out['objective'] = float(-lp['c'] @ x)
+        return out
+
+    def step(self, demand, capacity):
+        """Plan the next `window` hours from forecasts and commit the first one.
+        demand: (buildings, window); capacity: scalar or (window,).
+        Returns {'hour', 'allocation'} (+ 'charge', 'discharge', 'soc' with storage).
+        """
+        lp = self._build(demand, capacity)
+        plan = self._solve_highs(lp) if HIGHSPY_AVAILABLE else _solve_linprog(lp)
+
+        alloc = plan['allocations'][:, 0].copy()
+        committed = {'hour': self.hour, 'allocation': alloc}
+        self.state['prev'] = alloc
+        if self.storage:
+            committed.update(charge=plan['charge'][0], discharge=plan['discharge'][0], soc=plan['soc'][0])
+            self.state['soc'] = plan['soc'][0]
+        if self.daily_cap is not None:
+            if (self.hour + 1) % 24 == 0:
+                self.state['used_today'] = np.zeros(len(self.priority))
+            else:
+                self.state['used_today'] = self.state['used_today'] + alloc
+        self.hour += 1
+        return committed
@@ -0,0 +1,88 @@
+"""
+Energy Distribution PDF Report
+
+Builds the report entirely in memory: the efficiency heatmap is rendered
+with matplotlib's object API (no pyplot global state, so concurrent sessions
+don't interfere) into a BytesIO PNG, and the PDF is returned as bytes for
+st.download_button. Nothing is written to the working directory.
+
+Requires fpdf2 (in-memory images and bytes output).
+"""
+
+from io import BytesIO
+
+import numpy as np
+from fpdf import FPDF
+from matplotlib.figure import Figure
+
+# Above this many buildings the heatmap shows group averages instead of one row each
+MAX_HEATMAP_ROWS = 100
+
+COLUMNS = [("Building", 60), ("Total Demand (kWh)", 45), ("Allocated (kWh)", 45), ("Avg Efficiency (%)", 40)]
+
+def heatmap_png(buildings, efficiency, dpi=100):
+    """Render the efficiency heatmap to PNG bytes."""
+    efficiency = np.asarray(efficiency, dtype=np.float64)
+    num_buildings, hours = efficiency.shape
+    if num_buildings > MAX_HEATMAP_ROWS:
+        groups = np.array_split(np.arange(num_buildings), MAX_HEATMAP_ROWS)
+        grid = np.array([efficiency[g].mean(axis=0) for g in groups])
+        labels = [f"{buildings[g[0]]}-{g[-1] + 1}" for g in groups]
+    else:
+        grid = efficiency
+        labels = list(buildings)
+
+    fig = Figure(figsize=(10, 5))
+    ax = fig.subplots()
+    im = ax.imshow(grid, aspect='auto', cmap='viridis', origin='lower')
+    fig.colorbar(im, ax=ax, label='Efficiency (%)')
+    ax.set_xticks(np.arange(hours), labels=[f"{h}" for h in range(1, hours+1)])
+    step = max(1, len(labels) // 25)
+    ax.set_yticks(np.arange(0, len(labels), step), labels=labels[::step])
+    ax.set_title("Efficiency Heatmap (%)")
+    fig.tight_layout()
+
+    buf = BytesIO()
+    fig.savefig(buf, format='png', dpi=dpi)
+    return buf.getvalue()
+
+def _table_header(pdf):
+    pdf.set_font("Helvetica", "B", 10)
+    for title, width in COLUMNS:
+        pdf.cell(width, 7, title, border=1, align="C")
+    pdf.ln()
+    pdf.set_font("Helvetica", "", 10)
+
+def generate_pdf(buildings, demand, allocations, efficiency):
+    """Return the report as PDF bytes: title and heatmap, then a paginated summary table."""
+    demand = np.asarray(demand)
+    allocations = np.asarray(allocations)
+    efficiency = np.asarray(efficiency)
+
+    # Summary columns computed once for all buildings
+    total_demand = demand.sum(axis=1).astype(int)
+    total_alloc = allocations.sum(axis=1).astype(int)
+    avg_eff = np.round(efficiency.mean(axis=1), 2)
+
+    pdf = FPDF()
+    pdf.set_auto_page_break(auto=True, margin=15)
+    pdf.add_page()
+    pdf.set_font("Helvetica", "B", 16)
+    pdf.cell(0, 10, "Advanced Energy Distribution Report", new_x="LMARGIN", new_y="NEXT", align="C")
+    pdf.ln(5)
+    pdf.image(BytesIO(heatmap_png(buildings, efficiency)), x=10, w=190)
+
+    pdf.add_page()
+    _table_header(pdf)
+    bottom = pdf.h - pdf.b_margin
+    for i, b in enumerate(buildings):
+        # Repeat the header on every page of the table
+        if pdf.get_y() + 7 > bottom:
+            pdf.add_page()
+            _table_header(pdf)
+        row = (b, f"{total_demand[i]}", f"{total_alloc[i]}", f"{avg_eff[i]}")
+        for (_, width), text in zip(COLUMNS, row):
+            pdf.cell(width, 7, text, border=1)
+        pdf.ln()
+
+    return bytes(pdf.output())
@@ -1,12 +1,20 @@
 import streamlit as st
 import numpy as np
-import plotly.graph_objects as go
 import heapq
 
+from city_graph import CityGraph, random_city_graph
+import vrp
+from route_cache import RouteCache
+import graph_view
+
 # ----------------------------------------
 # GRAPH CREATION
 # ----------------------------------------
-def create_city_graph(n_nodes, max_weight=10, seed=1):
+def create_city_graph(n_nodes, max_weight=10, seed=1, degree=None):
+    # CSR graph with vectorized edge sampling; behaves like the dict-of-dicts below
+    return random_city_graph(n_nodes, max_weight=max_weight, seed=seed, degree=degree)
+
+def create_city_graph_dict(n_nodes, max_weight=10, seed=1):
     np.random.seed(seed)
     graph = {i: {} for i in range(n_nodes)}
 
@@ -22,6 +30,8 @@ def create_city_graph(n_nodes, max_weight=10, seed=1):
 # DIJKSTRA SHORTEST PATHS
 # ----------------------------------------
 def dijkstra(graph, start):
+    if isinstance(graph, CityGraph):
+        return graph.dijkstra(start)
     dist = {node: float('inf') for node in graph}
     parent = {node: None for node in graph}
     dist[start] = 0
@@ -72,60 +82,18 @@ def baseline_routes(depots, bins):
 # ----------------------------------------
 # OPTIMIZED AGENT ROUTING
 # ----------------------------------------
-def optimized_routes(graph, depots, bins):
-    routes = []
-    for depot in depots:
-        dist, parent = dijkstra(graph, depot)
-        sorted_bins = sorted(bins, key=lambda x: dist[x])  # nearest-first
-        route = [depot]
-        for b in sorted_bins:
-            path = shortest_path(parent, b)
-            route.extend(path[1:])  # avoid duplicating nodes
-        path_back = shortest_path(parent, depot)
-        route.extend(path_back[1:])
-        routes.append(route)
-    return routes
+def optimized_routes(graph, depots, bins, capacity=None, problem=None):
+    # Multi-truck VRP: savings construction + 2-opt / Or-opt, tours follow real streets
+    return vrp.solve(graph, depots, bins, capacity=capacity, problem=problem)['routes']
 
 # ----------------------------------------
 # GRAPH PLOT
 # ----------------------------------------
-def draw_graph(graph, routes_baseline=None, routes_opt=None):
-
-    edges_x = []
-    edges_y = []
-    pos = {}
-
-    # generate random positions for visualization
-    for node in graph:
-        pos[node] = (np.random.rand(), np.random.rand())
-
-    for u in graph:
-        for v in graph[u]:
-            if u < v:
-                edges_x += [pos[u][0], pos[v][0], None]
-                edges_y += [pos[u][1], pos[v][1], None]
-
-    fig = go.Figure()
-
-    fig.add_trace(go.Scatter(
-        x=edges_x, y=edges_y,
-        mode='lines',
-        line=dict(width=1),
-        name="Roads"
-    ))
-
-    # Nodes
-    fig.add_trace(go.Scatter(
-        x=[pos[i][0] for i in graph],
-        y=[pos[i][1] for i in graph],
-        mode='markers+text',
-        text=[str(i) for i in graph],
-        textposition="top center",
-        marker=dict(size=12),
-        name="Nodes"
-    ))
-
-    return fig
+def draw_graph(graph, routes_baseline=None, routes_opt=None, pos=None, edges=None):
+    # WebGL figure from NumPy arrays; pass a cached layout / edge arrays to skip rebuilding them
+    if pos is None:
+        pos = graph_view.layout(len(graph))
+    return graph_view.figure(graph, pos, routes_baseline, routes_opt, edges=edges)
 
 # ----------------------------------------
 # STREAMLIT UI
@@ -133,33 +101,57 @@ def draw_graph(graph, routes_baseline=None, routes_opt=None):
 st.title("🚛 Smart Garbage Collection Routing Optimizer")
 st.write("Optimization using Dijkstra + AI agent routing")
 
-n_nodes = st.slider("Number of City Nodes", 6, 25, 12)
-n_bins = st.slider("Garbage Bin Count", 2, 10, 4)
+large_city = st.sidebar.checkbox("Large city (sparse street network)")
+if large_city:
+    n_nodes = st.slider("Number of City Nodes", 1000, 100000, 20000, step=1000)
+    n_bins = st.slider("Garbage Bin Count", 2, 500, 100)
+else:
+    n_nodes = st.slider("Number of City Nodes", 6, 25, 12)
+    n_bins = st.slider("Garbage Bin Count", 2, 10, 4)
 n_depots = st.slider("Depot Count", 1, 3, 1)
+capacity = st.slider("Truck Capacity (bins)", 1, n_bins, n_bins)
 
 st.sidebar.header("Random Seed")
 seed = st.sidebar.slider("Seed", 1, 999, 10)
 
-graph = create_city_graph(n_nodes, seed=seed)
+@st.cache_resource(max_entries=8)
+def cached_graph(n_nodes, seed, degree=None):
+    return create_city_graph(n_nodes, seed=seed, degree=degree)
 
-# pick bins & depots
-bins = list(range(1, 1+n_bins))
-depots = [0]  # depot always node 0
+@st.cache_resource(max_entries=8)
+def cached_layout(n_nodes, seed, degree=None):
+    # Layout and road arrays are computed once per graph, not on every rerun
+    pos = graph_view.layout(n_nodes, seed)
+    return pos, graph_view.edge_coords(cached_graph(n_nodes, seed, degree), pos, seed=seed)
 
-st.subheader("City Graph")
-fig = draw_graph(graph)
-st.plotly_chart(fig, use_container_width=True)
+@st.cache_resource
+def route_cache():
+    # Shortest-path trees shared across reruns; slider changes only add missing sources
+    return RouteCache()
+
+degree = 4 if large_city else None
+graph = cached_graph(n_nodes, seed, degree)
+pos, edges = cached_layout(n_nodes, seed, degree)
+
+# pick bins & depots
+depots = list(range(n_depots))
+bins = list(range(n_depots, n_depots + n_bins))
 
 # Baseline
 base = baseline_routes(depots, bins)
 
 # Optimized
-opt = optimized_routes(graph, depots, bins)
+opt = optimized_routes(graph, depots, bins, capacity,
+                       problem=route_cache().problem(graph, depots, bins, seed=seed))
 
 # Compute cost
 base_cost = sum(route_cost(r, graph) for r in base)
 opt_cost = sum(route_cost(r, graph) for r in opt)
 
+st.subheader("City Graph")
+fig = draw_graph(graph, base, opt, pos=pos, edges=edges)
+st.plotly_chart(fig, use_container_width=True)
+
 st.header("📊 Results Comparison")
 
 col1, col2 = st.columns(2)
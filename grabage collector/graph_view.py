@@ -0,0 +1,91 @@
+"""
+WebGL Rendering for the City Graph
+
+Builds the graph figure from NumPy arrays: the node layout is computed once
+per (graph size, seed) and reused, road segments are one x/y array pair with
+NaN breaks between edges, and every trace is a go.Scattergl so the browser
+draws with WebGL instead of one SVG element per point.
+
+Past MAX_EDGES roads a random sample of edges is drawn (the legend says how
+many), and node labels are only drawn for small graphs, so 100k-edge cities
+stay interactive. Baseline and optimized routes are overlaid on top.
+"""
+
+import numpy as np
+import plotly.graph_objects as go
+
+MAX_EDGES = 20000
+MAX_NODES = 20000
+MAX_LABELS = 50
+
+def layout(n_nodes, seed=0):
+    """Node positions, shape (n_nodes, 2), deterministic for a seed."""
+    return np.random.default_rng(seed).random((n_nodes, 2))
+
+def _segments(pos, u, v):
+    # x/y arrays [u0, v0, nan, u1, v1, nan, ...]
+    gap = np.full(len(u), np.nan)
+    x = np.column_stack([pos[u, 0], pos[v, 0], gap]).ravel()
+    y = np.column_stack([pos[u, 1], pos[v, 1], gap]).ravel()
+    return x, y
+
+def edge_coords(graph, pos, max_edges=MAX_EDGES, seed=0):
+    """Road segment arrays plus (edges drawn, total edges); decimated past max_edges."""
+    u, v, _ = graph.edges()
+    total = len(u)
+    if total > max_edges:
+        keep = np.sort(np.random.default_rng(seed).choice(total, max_edges, replace=False))
+        u, v = u[keep], v[keep]
+    x, y = _segments(pos, u, v)
+    return x, y, len(u), total
+
+def route_coords(routes, pos):
+    """One x/y array pair for a list of node routes, NaN between routes."""
+    xs, ys = [], []
+    for r in routes:
+        r = np.asarray(r, dtype=np.intp)
+        xs.append(np.append(pos[r, 0], np.nan))
+        ys.append(np.append(pos[r, 1], np.nan))
+    if not xs:
+        return np.empty(0), np.empty(0)
+    return np.concatenate(xs), np.concatenate(ys)
+
+def figure(graph, pos, routes_baseline=None, routes_opt=None, edges=None, seed=0):
+    """Scattergl figure of roads, nodes and route overlays.
+    `edges` is a precomputed edge_coords() result to skip rebuilding the road arrays."""
+    x, y, shown, total = edges if edges is not None else edge_coords(graph, pos, seed=seed)
+    name = "Roads" if shown == total else f"Roads ({shown:,} of {total:,} shown)"
+
+    fig = go.Figure()
+    fig.add_trace(go.Scattergl(
+        x=x, y=y,
+        mode='lines',
+        line=dict(width=1, color='rgba(150,150,150,0.5)'),
+        hoverinfo='skip',
+        name=name
+    ))
+
+    n = len(pos)
+    nodes = np.arange(n)
+    if n > MAX_NODES:
+        nodes = np.sort(np.random.default_rng(seed).choice(n, MAX_NODES, replace=False))
+    labels = n <= MAX_LABELS
+    fig.add_trace(go.Scattergl(
+        x=pos[nodes, 0], y=pos[nodes, 1],
+        mode='markers+text' if labels else 'markers',
+        text=nodes.astype(str) if labels else None,
+        textposition="top center",
+        hovertext=nodes.astype(str),
+        marker=dict(size=12 if labels else 3),
+        name="Nodes"
+    ))
+
+    for routes, label, line in ((routes_baseline, "Baseline Route", dict(width=2, dash='dash', color='orange')),
+                                (routes_opt, "Optimized Route", dict(width=4, color='limegreen'))):
+        if routes:
+            rx, ry = route_coords(routes, pos)
+            fig.add_trace(go.Scattergl(x=rx, y=ry, mode='lines+markers', line=line,
+                                       marker=dict(size=5), name=label))
+
+    fig.update_layout(xaxis=dict(visible=False), yaxis=dict(visible=False))
+    return fig
@@ -0,0 +1,123 @@
+"""
+Routing Cache for the Garbage Router
+
+Keeps shortest-path trees (one dist row and one predecessor row per source
+node) across Streamlit reruns, keyed by (graph hash, seed):
+
+- rows are cached per source, so changing the bin or depot count only runs
+  Dijkstra for sources not seen before, in a single multi-source call
+- rows are evicted least-recently-used once they hold more than `max_bytes`
+  (a row costs about n_nodes * 12 bytes: float64 dist plus int32 pred, so
+  the row budget shrinks as graphs grow), and whole graphs once more than
+  `max_graphs` are cached
+- update_edges() moves a graph's rows to its edited version and drops only
+  the sources whose tree the edit can change: a source is affected by a
+  heavier or removed edge that lies on its tree, or by a lighter or new edge
+  that would shorten a path from it
+"""
+
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+
+from vrp import RoutingProblem
+
+def graph_key(graph):
+    """Content hash of a CityGraph's CSR arrays."""
+    h = hashlib.blake2b(digest_size=16)
+    for a in (graph.indptr, graph.indices, graph.weights):
+        h.update(np.ascontiguousarray(a).tobytes())
+    return h.hexdigest()
+
+def _edge_changes(old, new):
+    """Edges that got heavier or vanished (u, v) and edges that got lighter or appeared (u, v, w)."""
+    n = old.n_nodes
+    ou, ov, ow = old.edges()
+    nu, nv, nw = new.edges()
+    okey = ou.astype(np.int64) * n + ov
+    nkey = nu.astype(np.int64) * n + nv
+    _, oi, ni = np.intersect1d(okey, nkey, assume_unique=True, return_indices=True)
+    removed = np.ones(len(okey), dtype=bool)
+    removed[oi] = False
+    added = np.ones(len(nkey), dtype=bool)
+    added[ni] = False
+    heavier = oi[nw[ni] > ow[oi]]
+    lighter = ni[nw[ni] < ow[oi]]
+    worse = np.concatenate([np.flatnonzero(removed), heavier])
+    better = np.concatenate([np.flatnonzero(added), lighter])
+    return (ou[worse], ov[worse]), (nu[better], nv[better], nw[better])
+
+class RouteCache:
+    def __init__(self, max_graphs=4, max_bytes=256 << 20):
+        self.max_graphs = max_graphs
+        self.max_bytes = max_bytes
+        self._graphs = OrderedDict()   # (graph hash, seed) -> OrderedDict(source -> (dist, pred))
+        self.hits = 0
+        self.misses = 0
+
+    def _rows(self, key):
+        if key in self._graphs:
+            self._graphs.move_to_end(key)
+        else:
+            self._graphs[key] = OrderedDict()
+            while len(self._graphs) > self.max_graphs:
+                self._graphs.popitem(last=False)
+        return self._graphs[key]
+
+    def nbytes(self):
+        """Bytes held by the cached dist / pred rows."""
+        return sum(d.nbytes + p.nbytes for rows in self._graphs.values() for d, p in rows.values())
+
+    def _evict(self):
+        total = self.nbytes()
+        for rows in self._graphs.values():
+            while rows and total > self.max_bytes:
+                _, (d, p) = rows.popitem(last=False)
+                total -= d.nbytes + p.nbytes
+
+    def trees(self, graph, sources, seed=None):
+        """(dist, pred) with one row per source, computing only the uncached sources."""
+        sources = [int(s) for s in sources]
+        rows = self._rows((graph_key(graph), seed))
+        missing = list(dict.fromkeys(s for s in sources if s not in rows))
+        self.misses += len(missing)
+        self.hits += len(sources) - len(missing)
+        if missing:
+            dist, pred = graph.shortest_paths(missing)
+            for s, d, p in zip(missing, dist, pred.astype(np.int32)):
+                rows[s] = (d, p)
+        for s in sources:
+            rows.move_to_end(s)
+        out = [rows[s] for s in sources]
+        self._evict()
+        if not out:
+            return np.empty((0, graph.n_nodes)), np.empty((0, graph.n_nodes), dtype=np.int32)
+        return np.array([d for d, _ in out]), np.array([p for _, p in out])
+
+    def problem(self, graph, depots, bins, demand=None, seed=None):
+        """vrp.RoutingProblem built from cached trees."""
+        stops = list(depots) + list(bins)
+        return RoutingProblem(graph, depots, bins, demand, trees=self.trees(graph, stops, seed))
+
+    def update_edges(self, old_graph, new_graph, seed=None):
+        """Carry cached trees from old_graph over to its edited version new_graph,
+        dropping only the sources whose shortest paths the edit can change.
+        Returns the number of rows kept."""
+        old_key = (graph_key(old_graph), seed)
+        rows = self._graphs.pop(old_key, None)
+        if not rows or old_graph.n_nodes != new_graph.n_nodes:
+            return 0
+        (wu, wv), (bu, bv, bw) = _edge_changes(old_graph, new_graph)
+        sources = list(rows)
+        dist = np.array([rows[s][0] for s in sources])
+        pred = np.array([rows[s][1] for s in sources])
+        on_tree = ((pred[:, wv] == wu) | (pred[:, wu] == wv)).any(axis=1)
+        shortcut = ((dist[:, bu] + bw < dist[:, bv]) | (dist[:, bv] + bw < dist[:, bu])).any(axis=1)
+        keep = ~(on_tree | shortcut)
+        kept = self._rows((graph_key(new_graph), seed))
+        for s, k in zip(sources, keep):
+            if k:
+                kept[s] = rows[s]
+        self._evict()
+        return int(keep.sum())
@@ -0,0 +1,295 @@
+"""
+Multi-Vehicle Garbage Collection Routing (VRP)
+
+RoutingProblem runs one multi-source Dijkstra from every depot and bin and
+keeps the stop-to-stop distance matrix plus the predecessor rows, so the
+matrix is built once and every later step (construction, local search,
+expanding tours back to street paths) reuses it.
+
+Stops are matrix indices: depots first, then bins. A route is an int array
+of stops that starts and ends at the same depot. Each bin is first given to
+its nearest depot, tours are constructed per depot (Clarke-Wright savings or
+nearest neighbor, split by truck capacity) and then improved:
+- 2-opt and Or-opt (segments of 1-3 bins) within each route, with all
+  candidate moves of a route scored at once as a NumPy matrix
+- relocation of segments between routes (also across depots) when the
+  receiving truck has capacity left
+
+solve() returns {'routes', 'stops', 'loads', 'depots', 'cost'}; routes are
+node paths along real streets, so route_cost() no longer charges for gaps.
+"""
+
+import numpy as np
+
+# Stand-in distance for stop pairs in different components
+UNREACHABLE = 1e9
+
+class RoutingProblem:
+    """Distance matrix and shortest-path trees over the stops. `trees` is an optional
+    precomputed (dist, pred) pair with one row per stop (see route_cache.RouteCache)."""
+
+    def __init__(self, graph, depots, bins, demand=None, trees=None):
+        self.graph = graph
+        self.depots = [int(d) for d in depots]
+        self.bins = [int(b) for b in bins]
+        self.k = len(self.depots)
+        self.stops = np.array(self.depots + self.bins, dtype=np.int64)
+        dist, self.pred = graph.shortest_paths(self.stops) if trees is None else trees
+        d = dist[:, self.stops]
+        self.reachable = np.isfinite(d)
+        self.D = np.where(self.reachable, d, UNREACHABLE)
+        demand = np.ones(len(self.bins)) if demand is None else np.asarray(demand, dtype=np.float64)
+        self.load = np.concatenate([np.zeros(self.k), demand])
+
+    def nearest_depot(self):
+        """Depot stop index for every bin stop."""
+        return np.argmin(self.D[:self.k, self.k:], axis=0)
+
+    def route_length(self, route):
+        route = np.asarray(route)
+        return float(self.D[route[:-1], route[1:]].sum())
+
+    def node_path(self, route):
+        """Expand a stop route to the node path along shortest street paths."""
+        path = [int(self.stops[route[0]])]
+        for i, j in zip(route[:-1], route[1:]):
+            src, target = self.stops[i], self.stops[j]
+            if not self.reachable[i, j]:
+                path.append(int(target))
+                continue
+            row = self.pred[i]
+            leg = []
+            while target != src:
+                leg.append(int(target))
+                target = row[target]
+            path.extend(leg[::-1])
+        return path
+
+# ----------------------------------------
+# CONSTRUCTION
+# ----------------------------------------
+def savings_routes(D, load, depot, members, capacity=np.inf):
+    """Clarke-Wright savings for one depot: merge route ends in order of
+    D[depot, i] + D[depot, j] - D[i, j] while the merged load fits a truck."""
+    members = [int(m) for m in members]
+    if not members:
+        return []
+    m = np.asarray(members)
+    d0 = D[depot, m]
+    iu, ju = np.triu_indices(len(m), 1)
+    saving = d0[iu] + d0[ju] - D[m[iu], m[ju]]
+    order = np.argsort(-saving, kind='stable')
+    order = order[saving[order] > 0]
+
+    routes = {s: [s] for s in members}
+    owner = {s: s for s in members}
+    loads = {s: load[s] for s in members}
+    for p in order.tolist():
+        i, j = members[iu[p]], members[ju[p]]
+        ri, rj = owner[i], owner[j]
+        if ri == rj or loads[ri] + loads[rj] > capacity:
+            continue
+        a, b = routes[ri], routes[rj]
+        if i not in (a[0], a[-1]) or j not in (b[0], b[-1]):
+            continue
+        if a[-1] != i:
+            a.reverse()
+        if b[0] != j:
+            b.reverse()
+        a.extend(b)
+        loads[ri] += loads.pop(rj)
+        for s in routes.pop(rj):
+            owner[s] = ri
+    return [np.array([depot] + r + [depot]) for r in routes.values()]
+
+def nearest_neighbor_routes(D, load, depot, members, capacity=np.inf):
+    """Start at the depot, always drive to the closest bin that still fits the
+    truck; when none fits, return to the depot and start a new truck."""
+    members = np.asarray(members, dtype=np.int64)
+    left = np.ones(len(members), dtype=bool)
+    routes = []
+    while left.any():
+        route, cur, used = [depot], depot, 0.0
+        while True:
+            fits = left & (load[members] + used <= capacity)
+            if not fits.any():
+                break
+            cand = np.flatnonzero(fits)
+            pick = cand[np.argmin(D[cur, members[cand]])]
+            cur = int(members[pick])
+            left[pick] = False
+            used += load[cur]
+            route.append(cur)
+        if len(route) == 1:
+            raise ValueError("a bin's demand exceeds the truck capacity")
+        routes.append(np.array(route + [depot]))
+    return routes
+
+CONSTRUCTIONS = {
+    'savings': savings_routes,
+    'nearest': nearest_neighbor_routes,
+}
+
+# ----------------------------------------
+# LOCAL SEARCH
+# ----------------------------------------
+def two_opt(D, route):
+    """2-opt: reverse route[i+1:j+1] while some reversal shortens the route.
+    Each round scores every (i, j) at once and applies the best improving reversal of
+    every row whose edge range [i, j] doesn't overlap one already taken."""
+    r = np.array(route)
+    while len(r) > 4:
+        Dr = D[np.ix_(r, r)]
+        ab = Dr.diagonal(1)
+        delta = np.triu(Dr[:-1, :-1] + Dr[1:, 1:] - ab[:, None] - ab[None, :], 2)
+        best_j = np.argmin(delta, axis=1)
+        gain = delta[np.arange(len(best_j)), best_j]
+        rows = np.flatnonzero(gain < -1e-9)
+        if not len(rows):
+            break
+        taken = []
+        for i in rows[np.argsort(gain[rows], kind='stable')].tolist():
+            j = int(best_j[i])
+            if all(j < ti or i > tj for ti, tj in taken):
+                taken.append((i, j))
+        for i, j in taken:
+            r[i + 1:j + 1] = r[i + 1:j + 1][::-1]
+    return r
+
+def _segments(D_src, src, length):
+    """Start positions and removal gains of every bins-only segment of `length` in route
+    src, given D_src = D[src][:, src]."""
+    s = np.arange(1, len(src) - length)
+    last = s + length - 1
+    gain = D_src[s - 1, s] + D_src[last, s + length] - D_src[s - 1, s + length]
+    return s, gain
+
+def _insertion(D_sd, D_ds, s, length, ab):
+    """Cost of inserting the segments starting at s between every consecutive pair of the
+    destination route, shape (segments, edges), best of forward/reversed, and the reversed
+    flag. D_sd = D[src][:, dst], D_ds = D[dst][:, src], ab the destination edge lengths."""
+    last = s + length - 1
+    fwd = D_ds[:-1, s].T + D_sd[last, 1:] - ab
+    rev = D_ds[:-1, last].T + D_sd[s, 1:] - ab
+    return np.minimum(fwd, rev), rev < fwd
+
+def _segment(route, start, length, reverse):
+    seg = route[start:start + length]
+    return seg[::-1] if reverse else seg
+
+def or_opt(D, route, max_len=3):
+    """Move segments of 1..max_len bins to a better position in the same route."""
+    r = np.array(route)
+    improved = True
+    while improved:
+        improved = False
+        Dr = D[np.ix_(r, r)]
+        ab = Dr.diagonal(1)
+        e = np.arange(len(r) - 1)
+        for length in range(1, min(max_len, len(r) - 3) + 1):
+            s, gain = _segments(Dr, r, length)
+            ins, rev = _insertion(Dr, Dr, s, length, ab)
+            touching = (e[None, :] >= s[:, None] - 1) & (e[None, :] <= s[:, None] + length - 1)
+            delta = np.where(touching, np.inf, ins - gain[:, None])
+            si, ei = np.unravel_index(np.argmin(delta), delta.shape)
+            if delta[si, ei] > -1e-9:
+                continue
+            start = s[si]
+            seg = _segment(r, start, length, rev[si, ei])
+            rest = np.concatenate([r[:start], r[start + length:]])
+            pos = ei + 1 if ei < start else ei + 1 - length
+            r = np.concatenate([rest[:pos], seg, rest[pos:]])
+            improved = True
+            break
+    return r
+
+def relocate(D, load, routes, capacity=np.inf, max_len=3):
+    """One pass of inter-route Or-opt: for every ordered pair of routes apply the best
+    segment move from A into B that fits B's truck and shortens the total.
+    Routes are updated in place; returns the indices of the routes that changed."""
+    loads = [float(load[r].sum()) for r in routes]
+    changed = set()
+    for a in range(len(routes)):
+        for b in range(len(routes)):
+            if a == b or len(routes[a]) <= 2:
+                continue
+            A, B = routes[a], routes[b]
+            D_aa = D[np.ix_(A, A)]
+            D_ab = D[np.ix_(A, B)]
+            D_ba = D[np.ix_(B, A)]
+            ab = D[B[:-1], B[1:]]
+            csum = np.concatenate([[0.0], np.cumsum(load[A])])
+            best = None
+            for length in range(1, min(max_len, len(A) - 2) + 1):
+                s, gain = _segments(D_aa, A, length)
+                fits = loads[b] + (csum[s + length] - csum[s]) <= capacity
+                if not fits.any():
+                    continue
+                ins, rev = _insertion(D_ab, D_ba, s, length, ab)
+                delta = np.where(fits[:, None], ins - gain[:, None], np.inf)
+                si, ei = np.unravel_index(np.argmin(delta), delta.shape)
+                if delta[si, ei] < -1e-9 and (best is None or delta[si, ei] < best[0]):
+                    best = (delta[si, ei], length, s[si], ei, rev[si, ei])
+            if best is None:
+                continue
+            _, length, start, ei, reverse = best
+            seg = _segment(A, start, length, reverse)
+            moved = float(load[seg].sum())
+            routes[a] = np.concatenate([A[:start], A[start + length:]])
+            routes[b] = np.concatenate([B[:ei + 1], seg, B[ei + 1:]])
+            loads[a] -= moved
+            loads[b] += moved
+            changed.update((a, b))
+    return changed
+
+def improve(D, load, routes, capacity=np.inf, max_rounds=20):
+    """Alternate intra-route 2-opt/Or-opt and inter-route relocation until nothing improves.
+    Routes that end up empty are dropped."""
+    routes = [np.array(r) for r in routes]
+    dirty = set(range(len(routes)))
+    for _ in range(max_rounds):
+        for i in dirty:
+            routes[i] = or_opt(D, two_opt(D, routes[i]))
+        dirty = relocate(D, load, routes, capacity)
+        if not dirty:
+            break
+    return [r for r in routes if len(r) > 2]
+
+# ----------------------------------------
+# SOLVER
+# ----------------------------------------
+def solve(graph, depots, bins, demand=None, capacity=None, trucks=None,
+          construction='savings', local_search=True, problem=None):
+    """Plan collection tours for all bins.
+
+    demand: per-bin load (default 1 each); capacity: truck capacity (None = unlimited,
+    one truck per depot); trucks: max trucks per depot (None = as many as needed).
+    Pass a prebuilt RoutingProblem to reuse its distance matrix.
+    """
+    problem = problem or RoutingProblem(graph, depots, bins, demand)
+    D, load = problem.D, problem.load
+    capacity = np.inf if capacity is None else capacity
+    if load[problem.k:].max(initial=0) > capacity:
+        raise ValueError("a bin's demand exceeds the truck capacity")
+
+    home = problem.nearest_depot()
+    build = CONSTRUCTIONS[construction]
+    routes = []
+    for d in range(problem.k):
+        members = problem.k + np.flatnonzero(home == d)
+        routes.extend(build(D, load, d, members, capacity))
+    if local_search:
+        routes = improve(D, load, routes, capacity)
+
+    depot_of = [int(r[0]) for r in routes]
+    if trucks is not None:
+        for d in range(problem.k):
+            if depot_of.count(d) > trucks:
+                raise ValueError(f"depot {problem.depots[d]} needs {depot_of.count(d)} trucks, only {trucks} available")
+    return {
+        'routes': [problem.node_path(r) for r in routes],
+        'stops': [problem.stops[r].tolist() for r in routes],
+        'loads': [float(load[r].sum()) for r in routes],
+        'depots': [problem.depots[d] for d in depot_of],
+        'cost': float(sum(problem.route_length(r) for r in routes)),
+    }
@@ -5,17 +5,40 @@ Reads allocations.csv and slots.json, generates a heatmap image
 """
 
 import csv
+import io
+import os
 import argparse
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 import matplotlib.pyplot as plt
 import numpy as np
 import json
 
+from allocation_log import log_files
+
 # Expect allocations.csv with header:
 # timestamp,car_id,car_size,slot_id,slot_size,cost
 
+def _log_paths(path):
+    # Every part allocation_log wrote for this base path (rotated partitions,
+    # per-session Parquet / Arrow files); the literal path if there are none
+    return log_files(path) or [path]
+
 def load_counts(csvfile):
-    """Count how many times each slot is used."""
+    """Count how many times each slot is used, over every file the log writer
+    produced for this path (see allocation_log.log_files).
+    Parquet / Arrow IPC logs written by allocation_log are read as typed columns.
+    """
+    c = Counter()
+    for path in _log_paths(csvfile):
+        if path.endswith(('.parquet', '.arrow')):
+            c.update(load_counts_columnar(path))
+        else:
+            c.update(load_counts_csv(path))
+    return c
+
+def load_counts_csv(csvfile):
+    """Slot usage counts from a single CSV log file."""
     c = Counter()
     with open(csvfile, 'r') as f:
         reader = csv.DictReader(f)
@@ -24,6 +47,103 @@ def load_counts(csvfile):
             c[slot] += 1
     return c
 
+def load_counts_columnar(path):
+    """Slot usage counts from a Parquet or Arrow IPC allocation log (only slot_id is read)."""
+    import pyarrow as pa
+    if path.endswith('.parquet'):
+        import pyarrow.parquet as pq
+        column = pq.read_table(path, columns=['slot_id']).column('slot_id')
+    else:
+        with pa.ipc.open_stream(path) as reader:
+            column = reader.read_all().column('slot_id')
+    counts = column.value_counts()
+    return Counter(dict(zip(counts.field('values').to_pylist(), counts.field('counts').to_pylist())))
+
+def _count_block(header, block):
+    """Slot counts for one chunk of CSV rows (header bytes are prepended for column lookup)."""
+    data = header + block
+    try:
+        import pyarrow as pa
+        from pyarrow import csv as pa_csv
+        table = pa_csv.read_csv(
+            pa.py_buffer(data),
+            read_options=pa_csv.ReadOptions(use_threads=False),
+            convert_options=pa_csv.ConvertOptions(include_columns=['slot_id'],
+                                                  column_types={'slot_id': pa.string()}),
+        )
+        counts = table.column('slot_id').value_counts()
+        return Counter(dict(zip(counts.field('values').to_pylist(), counts.field('counts').to_pylist())))
+    except ImportError:
+        pass
+    try:
+        import pandas as pd
+        col = pd.read_csv(io.BytesIO(data), usecols=['slot_id'], dtype={'slot_id': str}, engine='c')['slot_id']
+        return Counter(col.value_counts().to_dict())
+    except ImportError:
+        pass
+    c = Counter()
+    for row in csv.DictReader(io.StringIO(data.decode('utf-8'), newline='')):
+        c[row['slot_id']] += 1
+    return c
+
+def _count_range(args):
+    """Count slots in byte range [start, end) of the log, reading chunk_bytes at a time."""
+    path, header, start, end, chunk_bytes = args
+    c = Counter()
+    carry = b''
+    with open(path, 'rb') as f:
+        f.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            data = f.read(min(chunk_bytes, remaining))
+            if not data:
+                break
+            remaining -= len(data)
+            data = carry + data
+            cut = data.rfind(b'\n') + 1 if remaining > 0 else len(data)
+            block, carry = data[:cut], data[cut:]
+            if block.strip():
+                c.update(_count_block(header, block))
+    if carry.strip():
+        c.update(_count_block(header, carry))
+    return c
+
+def _split_ranges(path, parts):
+    """Header bytes plus `parts` byte ranges of the body, each starting on a line boundary."""
+    size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        header = f.readline()
+        body = f.tell()
+        bounds = [body]
+        for i in range(1, parts):
+            f.seek(body + (size - body) * i // parts)
+            f.readline()
+            bounds.append(max(f.tell(), bounds[-1]))
+    bounds.append(size)
+    return header, [(a, b) for a, b in zip(bounds, bounds[1:]) if b > a]
+
+def load_counts_bulk(csvfile, workers=None, chunk_bytes=64 << 20):
+    """Bulk version of load_counts for large backfills.
+    The file is split by byte range across a process pool; each worker parses
+    fixed-size chunks with the pyarrow CSV reader (pandas C engine if pyarrow
+    is missing) reading only slot_id as a string column, and the partial
+    Counters are merged. Rotated partitions are all read, like load_counts.
+    """
+    workers = workers or os.cpu_count() or 1
+    tasks = []
+    for path in _log_paths(csvfile):
+        header, ranges = _split_ranges(path, workers)
+        tasks += [(path, header, start, end, chunk_bytes) for start, end in ranges]
+    total = Counter()
+    if workers == 1 or len(tasks) <= 1:
+        for task in tasks:
+            total.update(_count_range(task))
+        return total
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for partial in pool.map(_count_range, tasks):
+            total.update(partial)
+    return total
+
 def layout_from_slots(slots_json):
     """
     Create a layout mapping slot_id -> (row, col).
@@ -61,11 +181,28 @@ def draw_heatmap(counts, slots_json, out_image='heatmap.png'):
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser()
-    parser.add_argument('--alloc', default='../allocations.csv', help='CSV allocations file')
+    parser.add_argument('--alloc', default='../allocations.csv', help='allocations log (.csv, .parquet or .arrow; rotated parts included)')
     parser.add_argument('--slots', default='../sample_data/slots.json', help='Slots JSON file')
     parser.add_argument('--out', default='heatmap.png', help='Output heatmap image')
+    parser.add_argument('--window-hours', type=float, help='only count usage in the last N hours (CSV log, incremental store only)')
+    parser.add_argument('--no-store', action='store_true',
+                        help='re-read the whole CSV instead of the incremental <alloc>.usage.json store')
+    parser.add_argument('--bulk', action='store_true', help='chunked multi-process read of the whole CSV (backfills)')
+    parser.add_argument('--workers', type=int, help='processes for --bulk (default: CPU count)')
     args = parser.parse_args()
+    # Only the incremental store keeps per-hour counts; the other paths count the whole history
+    if args.window_hours is not None and (args.bulk or args.no_store or not args.alloc.endswith('.csv')):
+        parser.error('--window-hours needs the incremental store: a .csv --alloc without --bulk or --no-store')
 
-    counts = load_counts(args.alloc)
+    if args.bulk:
+        counts = load_counts_bulk(args.alloc, args.workers)
+    elif args.no_store or not args.alloc.endswith('.csv'):
+        counts = load_counts(args.alloc)
+    else:
+        from usage_store import load_counts_incremental
+        # One sidecar store per rotated CSV part
+        counts = Counter()
+        for path in _log_paths(args.alloc):
+            counts.update(load_counts_incremental(path, args.window_hours))
     slots_json = json.load(open(args.slots))
     draw_heatmap(counts, slots_json, args.out)
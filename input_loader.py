@@ -0,0 +1,252 @@
+"""
+Compact, Validated Vehicle / Slot Loading
+
+Parses vehicles.json and slots.json once into columnar tables instead of
+lists of dicts:
+- Vehicles: ids, size_codes (int16)
+- Slots:    ids, size_codes, distance, priority (float64)
+Size labels are interned into a small per-table category tuple (`sizes`),
+so 100k records hold a handful of label strings instead of 100k.
+
+Every record is validated on load (object with a string/int "id" and an
+optional string "size"; slots may add numeric, non-negative "distance" and
+numeric "priority", both defaulting to 0). Errors name the file and record
+index. Ids keep their JSON type (an int64 column when all are integers); a
+missing size is kept as the None label, like the dict comparison does.
+
+JSON backends, fastest available: ijson (streaming, for files over
+STREAM_BYTES), orjson, then the standard library.
+
+With cache=True the parsed columns are stored next to the source as .npy
+files in <file>.npycache/ and memory-mapped on later loads while the
+source's size and mtime are unchanged, so repeated runs skip JSON parsing.
+A damaged cache or a read-only directory just falls back to parsing.
+
+Tables still index like the old lists (table[i] -> {'id': ..., 'size': ...}),
+so code written for dicts keeps working; agent.encode_sizes / encode_slots
+use the columns directly.
+"""
+
+import json
+import numbers
+import os
+import shutil
+import sys
+from itertools import islice
+
+import numpy as np
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except Exception:
+    ORJSON_AVAILABLE = False
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except Exception:
+    IJSON_AVAILABLE = False
+
+# Files above this size are streamed with ijson when it is installed
+STREAM_BYTES = 256 << 20
+
+CACHE_VERSION = 2
+
+class Vehicles:
+    __slots__ = ('ids', 'size_codes', 'sizes')
+    kind = 'vehicles'
+    numeric = ()
+
+    def __init__(self, ids, size_codes, sizes):
+        self.ids = ids
+        self.size_codes = size_codes
+        self.sizes = tuple(s if s is None else sys.intern(s) for s in sizes)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, i):
+        rid = self.ids[i]
+        rid = int(rid) if self.ids.dtype.kind == 'i' else str(rid) if self.ids.dtype.kind == 'U' else rid
+        return {'id': rid, 'size': self.sizes[self.size_codes[i]]}
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+class Slots(Vehicles):
+    __slots__ = ('distance', 'priority')
+    kind = 'slots'
+    numeric = ('distance', 'priority')
+
+    def __init__(self, ids, size_codes, sizes, distance, priority):
+        super().__init__(ids, size_codes, sizes)
+        self.distance = distance
+        self.priority = priority
+
+    def __getitem__(self, i):
+        rec = super().__getitem__(i)
+        rec['distance'] = float(self.distance[i])
+        rec['priority'] = float(self.priority[i])
+        return rec
+
+def _records(path):
+    if IJSON_AVAILABLE and os.path.getsize(path) > STREAM_BYTES:
+        with open(path, 'rb') as f:
+            # ijson.items(f, 'item') silently yields nothing for a non-array document
+            events = ijson.parse(f)
+            first = next(events, (None, None, None))
+            if first[1] != 'start_array':
+                raise ValueError(f'{path}: expected a JSON array of records')
+            f.seek(0)
+            yield from ijson.items(f, 'item')
+        return
+    with open(path, 'rb') as f:
+        data = orjson.loads(f.read()) if ORJSON_AVAILABLE else json.load(f)
+    if not isinstance(data, list):
+        raise ValueError(f'{path}: expected a JSON array of records')
+    yield from data
+
+def _number(path, i, rec, field, minimum=None):
+    value = rec.get(field, 0)
+    # ijson yields Decimal, the other parsers int/float
+    if isinstance(value, (bool, complex)) or not isinstance(value, numbers.Number):
+        raise ValueError(f'{path}: record {i}: "{field}" must be a number, got {value!r}')
+    value = float(value)
+    if minimum is not None and value < minimum:
+        raise ValueError(f'{path}: record {i}: "{field}" must be >= {minimum}, got {value}')
+    return value
+
+def _check_record(path, i, rec, table):
+    """Per-record validation; only run to locate the error once a batch fails."""
+    if not isinstance(rec, dict):
+        raise ValueError(f'{path}: record {i}: expected an object, got {type(rec).__name__}')
+    rid = rec.get('id')
+    if isinstance(rid, bool) or not isinstance(rid, (str, int)):
+        raise ValueError(f'{path}: record {i}: "id" must be a string or integer, got {rid!r}')
+    size = rec.get('size')
+    if size is not None and not isinstance(size, str):
+        raise ValueError(f'{path}: record {i}: "size" must be a string, got {size!r}')
+    if table.numeric:
+        _number(path, i, rec, 'distance', minimum=0)
+        _number(path, i, rec, 'priority')
+
+def _column_batch(batch, table, labels):
+    """Columns of one batch, or None if any record is malformed (checked per column type)."""
+    try:
+        ids = [r['id'] for r in batch]
+        sizes = [r.get('size') for r in batch]
+        num = [[r.get(f, 0) for r in batch] for f in table.numeric]
+    except (KeyError, TypeError, AttributeError):
+        return None
+    if not set(map(type, ids)) <= {str, int} or not set(map(type, sizes)) <= {str, type(None)}:
+        return None
+    cols = []
+    for values in num:
+        kinds = set(map(type, values))
+        if not kinds <= {int, float} and not all(
+                isinstance(v, numbers.Number) and not isinstance(v, (bool, complex)) for v in values):
+            return None
+        cols.append(np.array(values, dtype=np.float64))
+    if table.numeric and len(cols[0]) and cols[0].min() < 0:
+        return None
+    codes = [labels.setdefault(x, len(labels)) for x in sizes]
+    return ids, codes, cols
+
+def _id_column(ids):
+    """int64 if every id is an integer, fixed-width str if every id is a string,
+    else an object array (mixed ids; not cached)."""
+    kinds = set(map(type, ids))
+    if kinds == {int}:
+        try:
+            return np.array(ids, dtype=np.int64)
+        except OverflowError:
+            pass
+    elif kinds <= {str}:
+        return np.array(ids, dtype=str) if ids else np.empty(0, dtype='<U1')
+    return np.array(ids, dtype=object)
+
+def _parse(path, table, batch_size=1 << 16):
+    ids, codes = [], []
+    labels = {}
+    numeric = [[] for _ in table.numeric]
+    records = _records(path)
+    start = 0
+    while True:
+        batch = list(islice(records, batch_size))
+        if not batch:
+            break
+        cols = _column_batch(batch, table, labels)
+        if cols is None:
+            for i, rec in enumerate(batch):
+                _check_record(path, start + i, rec, table)
+            raise ValueError(f'{path}: malformed records {start}..{start + len(batch) - 1}')
+        ids.extend(cols[0])
+        codes.extend(cols[1])
+        for out, col in zip(numeric, cols[2]):
+            out.append(col)
+        start += len(batch)
+    columns = [_id_column(ids), np.array(codes, dtype=np.int16), list(labels)]
+    columns += [np.concatenate(col) if col else np.empty(0) for col in numeric]
+    return table(*columns)
+
+def _cache_dir(path):
+    return path + '.npycache'
+
+def _source_stamp(path):
+    st = os.stat(path)
+    return {'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+
+def _read_cache(path, table):
+    """Cached table, or None if there is no valid cache (missing or damaged files count as none)."""
+    cache = _cache_dir(path)
+    try:
+        with open(os.path.join(cache, 'meta.json')) as f:
+            meta = json.load(f)
+        if meta.get('version') != CACHE_VERSION or meta.get('kind') != table.kind \
+                or meta.get('source') != _source_stamp(path):
+            return None
+        cols = [np.load(os.path.join(cache, f'{name}.npy'), mmap_mode='r')
+                for name in ('ids', 'size_codes') + table.numeric]
+        return table(cols[0], cols[1], meta['sizes'], *cols[2:])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+def _write_cache(path, data):
+    """Store the columns next to path; skipped (best effort) for mixed-type ids
+    or when the directory is not writable."""
+    if data.ids.dtype == object:
+        return
+    cache = _cache_dir(path)
+    tmp = cache + f'.tmp{os.getpid()}'
+    try:
+        shutil.rmtree(tmp, ignore_errors=True)
+        os.makedirs(tmp)
+        for name in ('ids', 'size_codes') + data.numeric:
+            np.save(os.path.join(tmp, f'{name}.npy'), getattr(data, name))
+        meta = {'version': CACHE_VERSION, 'kind': data.kind, 'sizes': list(data.sizes),
+                'source': _source_stamp(path)}
+        with open(os.path.join(tmp, 'meta.json'), 'w') as f:
+            json.dump(meta, f)
+        shutil.rmtree(cache, ignore_errors=True)
+        os.replace(tmp, cache)
+    except OSError:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+def _load(path, table, cache):
+    if cache:
+        data = _read_cache(path, table)
+        if data is not None:
+            return data
+    data = _parse(path, table)
+    if cache:
+        _write_cache(path, data)
+    return data
+
+def load_vehicles(path, cache=False):
+    """Validated Vehicles table from a vehicles JSON file."""
+    return _load(path, Vehicles, cache)
+
+def load_slots(path, cache=False):
+    """Validated Slots table from a slots JSON file."""
+    return _load(path, Slots, cache)
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+NumPy linear assignment solvers (no SciPy required)
+
+Used by agent.assign_hungarian when scipy.optimize.linear_sum_assignment
+is not installed (edge kiosks).
+
+- hungarian(cost): exact O(n^3) shortest augmenting path (Jonker-Volgenant
+  style with row/column potentials); the inner column scan is vectorized.
+- auction(cost): Bertsekas auction with epsilon scaling and Jacobi (all
+  unassigned rows bid at once) rounds, plus a reverse auction pass on
+  rectangular problems. Suited to large rectangular problems.
+  With the default eps, costs are scaled onto their decimal grid (integers,
+  or at most MAX_DECIMALS decimals such as distance x weight) and the result
+  is exact; other float costs are rejected. An explicit eps skips the scaling
+  and gives a result within n*eps of the optimum.
+
+Both return (row_ind, col_ind) like linear_sum_assignment: one entry per
+row of the smaller side, sorted by row.
+"""
+
+import numpy as np
+
+MAX_DECIMALS = 6
+
+def _prepare(cost):
+    arr = np.asarray(cost, dtype=np.float64)
+    if arr.ndim != 2:
+        raise ValueError('cost matrix must be 2-D')
+    if not np.isfinite(arr).all():
+        raise ValueError('cost matrix contains non-finite entries')
+    transposed = arr.shape[0] > arr.shape[1]
+    return (arr.T if transposed else arr), transposed
+
+def _finish(rows, cols, transposed):
+    if transposed:
+        rows, cols = cols, rows
+    order = np.argsort(rows, kind='stable')
+    return rows[order], cols[order]
+
+def hungarian(cost):
+    """Minimum-cost assignment by shortest augmenting paths. Returns (row_ind, col_ind)."""
+    arr, transposed = _prepare(cost)
+    n, m = arr.shape
+    if n == 0 or m == 0:
+        empty = np.empty(0, dtype=np.intp)
+        return empty, empty
+
+    # 1-based indexing as in the classic formulation; column 0 is the virtual root
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    match = np.zeros(m + 1, dtype=np.intp)  # match[j] = row assigned to column j (0 = free)
+    way = np.zeros(m + 1, dtype=np.intp)
+
+    for i in range(1, n + 1):
+        match[0] = i
+        j0 = 0
+        minv = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            i0 = match[j0]
+            free = ~used[1:]
+            reduced = arr[i0 - 1] - u[i0] - v[1:]
+            better = free & (reduced < minv[1:])
+            minv[1:][better] = reduced[better]
+            way[1:][better] = j0
+
+            candidates = np.where(free, minv[1:], np.inf)
+            j1 = int(np.argmin(candidates)) + 1
+            delta = candidates[j1 - 1]
+
+            u[match[used]] += delta
+            v[used] -= delta
+            minv[~used] -= delta
+            j0 = j1
+            if match[j0] == 0:
+                break
+
+        # Augment along the alternating path back to the root
+        while j0:
+            j1 = way[j0]
+            match[j0] = match[j1]
+            j0 = j1
+
+    cols = np.flatnonzero(match[1:]).astype(np.intp)
+    rows = match[1:][cols] - 1
+    return _finish(rows, cols, transposed)
+
+def _auction_phase(benefit, prices, eps, block_cells):
+    """Run Jacobi auction rounds until every row owns a column. Mutates prices."""
+    n, m = benefit.shape
+    owner = np.full(m, -1, dtype=np.intp)
+    assigned = np.full(n, -1, dtype=np.intp)
+    unassigned = np.arange(n)
+    block = max(1, block_cells // m)
+
+    while unassigned.size:
+        best_j = np.empty(unassigned.size, dtype=np.intp)
+        gain = np.empty(unassigned.size)
+        # Bid computation in row blocks so the temporary stays bounded
+        for start in range(0, unassigned.size, block):
+            rows = unassigned[start:start + block]
+            vals = benefit[rows] - prices
+            if m == 1:
+                best_j[start:start + len(rows)] = 0
+                gain[start:start + len(rows)] = 0.0
+                continue
+            top2 = np.argpartition(vals, m - 2, axis=1)[:, -2:]
+            idx = np.arange(len(rows))
+            v_a = vals[idx, top2[:, 0]]
+            v_b = vals[idx, top2[:, 1]]
+            first = v_b >= v_a
+            best_j[start:start + len(rows)] = np.where(first, top2[:, 1], top2[:, 0])
+            gain[start:start + len(rows)] = np.abs(v_b - v_a)
+        bids = prices[best_j] + gain + eps
+
+        # Highest bid wins each contested column
+        order = np.lexsort((bids, best_j))
+        js = best_j[order]
+        last = np.empty(js.size, dtype=bool)
+        last[:-1] = js[1:] != js[:-1]
+        last[-1] = True
+        win = order[last]
+
+        cols = best_j[win]
+        displaced = owner[cols]
+        assigned[displaced[displaced >= 0]] = -1
+        owner[cols] = unassigned[win]
+        assigned[unassigned[win]] = cols
+        prices[cols] = bids[win]
+        unassigned = np.flatnonzero(assigned < 0)
+
+    return assigned, owner
+
+def _reverse_phase(benefit, prices, assigned, owner, eps):
+    """Reverse auction (Bertsekas-Castanon) for rectangular problems: every free
+    column priced above the cheapest owned one either drops to that floor or
+    takes its best row, whose old column is then checked in turn. Keeps
+    eps-complementary slackness, so afterwards the assignment is eps-optimal.
+    Mutates prices."""
+    n, _ = benefit.shape
+    profit = benefit[np.arange(n), assigned] - prices[assigned]
+    floor = prices[owner >= 0].min()
+    pending = np.flatnonzero((owner < 0) & (prices > floor)).tolist()
+    while pending:
+        j = pending.pop()
+        vals = benefit[:, j] - profit
+        if n == 1:
+            i, second = 0, -np.inf
+        else:
+            top2 = np.argpartition(vals, n - 2)[-2:]
+            i, k = (top2[1], top2[0]) if vals[top2[1]] >= vals[top2[0]] else (top2[0], top2[1])
+            second = vals[k]
+        if floor >= vals[i] - eps:
+            prices[j] = floor
+            continue
+        prices[j] = max(floor, second - eps)
+        profit[i] = benefit[i, j] - prices[j]
+        old = assigned[i]
+        owner[old] = -1
+        owner[j] = i
+        assigned[i] = j
+        if prices[old] > floor:
+            pending.append(old)
+    return assigned, owner
+
+def _resolution(arr, n):
+    """Grid step 10**-k (k <= MAX_DECIMALS) all costs lie on, or None.
+    Rounding error must stay far below one step over n assigned pairs."""
+    tol = 1e-3 / (n + 1)
+    for k in range(MAX_DECIMALS + 1):
+        scaled = arr * 10.0 ** k
+        if np.abs(scaled - np.rint(scaled)).max() <= tol:
+            return 10.0 ** -k
+    return None
+
+def auction(cost, eps=None, theta=5.0, block_cells=1 << 22):
+    """Minimum-cost assignment by the auction algorithm. Returns (row_ind, col_ind).
+
+    eps is the final bidding increment. By default costs are scaled to integers
+    on their decimal grid and eps is 1/(n+1), which makes the result exact;
+    costs with more than MAX_DECIMALS decimals raise ValueError (pass eps to
+    accept a result within n*eps). theta is the epsilon-scaling factor per
+    phase and block_cells caps the size of the temporary bid matrix.
+    """
+    arr, transposed = _prepare(cost)
+    n, m = arr.shape
+    if n == 0 or m == 0:
+        empty = np.empty(0, dtype=np.intp)
+        return empty, empty
+
+    if eps is None:
+        step = _resolution(arr, n)
+        if step is None:
+            raise ValueError(f'auction needs costs with at most {MAX_DECIMALS} decimals to be exact; '
+                             'use the hungarian method or pass eps explicitly')
+        benefit = -np.rint(arr / step)
+        # Within n*eps of the optimum, so below one grid step
+        eps_final = 1.0 / (n + 1)
+    else:
+        benefit = -arr
+        eps_final = float(eps)
+    prices = np.zeros(m)
+    cur = max(float(np.ptp(benefit)) / 2.0, eps_final)
+    while True:
+        assigned, owner = _auction_phase(benefit, prices, cur, block_cells)
+        # With more columns than rows the result is only eps-optimal if no free
+        # column is priced above the cheapest owned one; scaling breaks that, so
+        # restore it after every phase while the increment is still coarse
+        if m > n:
+            assigned, owner = _reverse_phase(benefit, prices, assigned, owner, cur)
+        if cur <= eps_final:
+            break
+        cur = max(cur / theta, eps_final)
+
+    rows = np.arange(n, dtype=np.intp)
+    return _finish(rows, assigned, transposed)
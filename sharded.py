@@ -0,0 +1,138 @@
+"""
+Sharded Multi-Lot Parking Allocation
+
+Large deployments span many lots/levels, identified by the slot ID prefix
+letter (the row letter heatmap.layout_from_slots uses: 'A12' -> lot A).
+Instead of one assignment over every car and slot, the sharded solver:
+
+1. routes cars to lots with a capacity-aware pre-assignment: a slot's cost
+   does not depend on which car of a size class takes it, so each class
+   claims its cheapest same-size slots city-wide and cars left over once
+   their class is full claim the cheapest remaining slots (paying
+   size_penalty); each lot receives as many cars of each class as slots it
+   contributed. Like agent.assign_partitioned this is a "same size first"
+   rule, so the total matches the dense optimum only while size_penalty is
+   at least the spread of slot costs; with smaller custom weights it can
+   be slightly higher
+2. solves every lot's (cars x slots) sub-matrix with assign_hungarian in a
+   ProcessPoolExecutor, largest lots first
+3. merges the per-lot results back to global indices for one allocation log
+
+Workers receive only encoded columns (size codes, distance, priority), not
+the record dicts. gap_report() compares the result with a reference solve.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import agent
+from telemetry import tracer
+
+def zone_codes(slots):
+    """(zone index per slot, zone labels) from the slot ID prefix letter."""
+    ids = slots.ids if hasattr(slots, 'ids') else [s['id'] for s in slots]
+    letters = np.array([str(sid)[:1].upper() for sid in ids])
+    labels, zone = np.unique(letters, return_inverse=True)
+    return zone.astype(np.intp), labels.tolist()
+
+def preassign(car_codes, slot_codes, base, zone):
+    """Zone index per car (-1 if no slot is left for it)."""
+    car_zone = np.full(len(car_codes), -1, dtype=np.intp)
+    free = np.ones(len(slot_codes), dtype=bool)
+    leftover = []
+    for code in np.unique(car_codes):
+        rows = np.flatnonzero(car_codes == code)
+        cols = agent._cheapest(np.flatnonzero(slot_codes == code), base, len(rows))
+        k = min(len(rows), len(cols))
+        car_zone[rows[:k]] = zone[cols[:k]]
+        free[cols[:k]] = False
+        leftover.append(rows[k:])
+    rows = np.concatenate(leftover) if leftover else np.empty(0, dtype=np.intp)
+    if len(rows) and free.any():
+        # Every free slot is a size mismatch for these cars, so the penalty is a constant offset
+        cols = agent._cheapest(np.flatnonzero(free), base, len(rows))
+        k = min(len(rows), len(cols))
+        car_zone[rows[:k]] = zone[cols[:k]]
+    return car_zone
+
+def _solve_zone(task):
+    rows, cols, car_codes, slot_codes, dist, prio, weights, method = task
+    matrix = agent.cost_block(car_codes, slot_codes, dist, prio, weights)
+    pairs, _ = agent.assign_hungarian(matrix, method)
+    r = np.fromiter((p[0] for p in pairs), dtype=np.intp, count=len(pairs))
+    c = np.fromiter((p[1] for p in pairs), dtype=np.intp, count=len(pairs))
+    return rows[r], cols[c], matrix[r, c]
+
+def assign_sharded(cars, slots, weights=None, workers=None, method=None):
+    """Per-lot assignment in a process pool. Returns (assignments, total) like solve():
+    assignments are [((car_idx, slot_idx), cost), ...] sorted by car index.
+    workers=1 solves the lots in-process.
+    """
+    weights = weights or agent.DEFAULT_WEIGHTS
+    car_codes, slot_codes = agent.encode_sizes(cars, slots)
+    dist, prio = agent.encode_slots(slots)
+    base = weights['distance'] * dist + weights['priority'] * prio
+    zone, labels = zone_codes(slots)
+    car_zone = preassign(car_codes, slot_codes, base, zone)
+
+    tasks = []
+    for z in range(len(labels)):
+        rows = np.flatnonzero(car_zone == z)
+        if not len(rows):
+            continue
+        cols = np.flatnonzero(zone == z)
+        tasks.append((rows, cols, car_codes[rows], slot_codes[cols], dist[cols], prio[cols], weights, method))
+    tasks.sort(key=lambda t: len(t[0]) * len(t[1]), reverse=True)
+
+    with tracer.span('assign_sharded', zones=len(tasks), workers=workers or os.cpu_count(),
+                     rows=len(car_codes), cols=len(slot_codes)):
+        if workers == 1 or len(tasks) <= 1:
+            results = list(map(_solve_zone, tasks))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_solve_zone, tasks))
+
+    if not results:
+        return [], 0.0
+    r = np.concatenate([res[0] for res in results])
+    c = np.concatenate([res[1] for res in results])
+    cost = np.concatenate([res[2] for res in results])
+    order = np.argsort(r, kind='stable')
+    r, c, cost = r[order], c[order], cost[order]
+    return list(zip(zip(r.tolist(), c.tolist()), cost.tolist())), float(cost.sum())
+
+def gap_report(cars, slots, weights=None, workers=None, method=None, dense_cells=25_000_000,
+               sharded_total=None, sharded_seconds=None):
+    """Sharded solve vs a reference solve: totals, gap and timings.
+    The reference is the dense (optimal) solve up to dense_cells matrix cells. Above
+    that it is the size-partitioned solve, which is not the optimum with small
+    size_penalty weights, so reference_optimal is False and the gap can be negative.
+    Pass sharded_total / sharded_seconds from a solve already done to skip re-running it.
+    The reference solve is not traced, so --trace / --metrics describe the sharded run only.
+    """
+    if sharded_total is None:
+        t0 = time.perf_counter()
+        _, sharded_total = assign_sharded(cars, slots, weights, workers, method)
+        sharded_seconds = time.perf_counter() - t0
+
+    reference = 'dense' if len(cars) * len(slots) <= dense_cells else 'partitioned'
+    with tracer.paused():
+        t0 = time.perf_counter()
+        _, ref = agent.solve(cars, slots, weights, solver=reference, method=method)
+        t_ref = time.perf_counter() - t0
+
+    gap = sharded_total - ref
+    return {
+        'sharded_total': sharded_total,
+        'reference_total': ref,
+        'reference_solver': reference,
+        'reference_optimal': reference == 'dense',
+        'gap': gap,
+        'gap_pct': 100.0 * gap / abs(ref) if ref else 0.0,
+        'sharded_seconds': sharded_seconds,
+        'reference_seconds': t_ref,
+        'workers': workers or os.cpu_count(),
+    }
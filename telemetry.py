@@ -0,0 +1,153 @@
+"""
+Spans and Metrics for the Allocation Agent
+
+A Tracer records timed spans (name, wall-clock start, duration, attributes)
+plus counters and gauges, and exports them as:
+- JSON lines, one object per span (write_json)
+- Prometheus text exposition format (write_prometheus), written atomically
+  so a node_exporter textfile collector never reads a partial file
+
+Tracing is off by default. A disabled tracer hands out one shared no-op
+span and ignores counters/gauges, so instrumented code pays a method call
+and an attribute check per span and nothing else.
+
+    from telemetry import tracer
+    with tracer.span('solve', rows=n) as sp:
+        ...
+        sp.set(method='scipy')
+"""
+
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+class _NoopSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+_NOOP = _NoopSpan()
+
+class _Span:
+    __slots__ = ('tracer', 'name', 'attrs', 'wall', 'start')
+
+    def __init__(self, tracer, name, attrs):
+        self.tracer = tracer
+        self.name = name
+        self.attrs = attrs
+
+    def set(self, **attrs):
+        """Attach attributes known only once the work is done (rows written, ...)."""
+        self.attrs.update(attrs)
+
+    def __enter__(self):
+        self.wall = time.time()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter() - self.start
+        self.tracer._finish(self, duration, exc_type)
+        return False
+
+def _labels(labels):
+    if not labels:
+        return ''
+    def esc(v):
+        return str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return '{' + ','.join(f'{k}="{esc(v)}"' for k, v in labels) + '}'
+
+class Tracer:
+    def __init__(self, enabled=False, prefix='agent'):
+        self.enabled = enabled
+        self.prefix = prefix
+        self.reset()
+
+    def reset(self):
+        self.spans = []
+        self.counters = {}   # (name, labels) -> value
+        self.gauges = {}     # (name, labels) -> value
+        self._span_stats = {}  # span name -> [count, seconds, errors]
+
+    @contextmanager
+    def paused(self):
+        """Record nothing inside the block (e.g. a side computation that is not part of the run)."""
+        enabled, self.enabled = self.enabled, False
+        try:
+            yield
+        finally:
+            self.enabled = enabled
+
+    def span(self, name, **attrs):
+        if not self.enabled:
+            return _NOOP
+        return _Span(self, name, attrs)
+
+    def _finish(self, span, duration, exc_type):
+        record = {'span': span.name, 'start': span.wall, 'duration_s': duration}
+        if exc_type is not None:
+            record['error'] = exc_type.__name__
+        record.update(span.attrs)
+        self.spans.append(record)
+        stats = self._span_stats.setdefault(span.name, [0, 0.0, 0])
+        stats[0] += 1
+        stats[1] += duration
+        stats[2] += exc_type is not None
+
+    def count(self, name, value=1, **labels):
+        if self.enabled:
+            key = (name, tuple(sorted(labels.items())))
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def gauge(self, name, value, **labels):
+        if self.enabled:
+            self.gauges[(name, tuple(sorted(labels.items())))] = value
+
+    def write_json(self, path='-'):
+        """Span records as JSON lines to a file (appended) or '-' for stderr."""
+        lines = ''.join(json.dumps(r, default=str) + '\n' for r in self.spans)
+        if path == '-':
+            sys.stderr.write(lines)
+        else:
+            with open(path, 'a') as f:
+                f.write(lines)
+
+    def prometheus(self):
+        """Metrics in Prometheus text exposition format."""
+        p = self.prefix
+        out = []
+        if self._span_stats:
+            out.append(f'# HELP {p}_span_seconds Time spent in instrumented spans.')
+            out.append(f'# TYPE {p}_span_seconds summary')
+            for name, (count, seconds, _) in sorted(self._span_stats.items()):
+                lab = _labels((('span', name),))
+                out.append(f'{p}_span_seconds_sum{lab} {seconds:.9g}')
+                out.append(f'{p}_span_seconds_count{lab} {count}')
+            out.append(f'# TYPE {p}_span_errors_total counter')
+            for name, (_, _, errors) in sorted(self._span_stats.items()):
+                out.append(f'{p}_span_errors_total{_labels((("span", name),))} {errors}')
+        for kind, values in (('counter', self.counters), ('gauge', self.gauges)):
+            seen = set()
+            for (name, labels), value in sorted(values.items(), key=lambda kv: (kv[0][0], kv[0][1])):
+                metric = f'{p}_{name}'
+                if metric not in seen:
+                    out.append(f'# TYPE {metric} {kind}')
+                    seen.add(metric)
+                out.append(f'{metric}{_labels(labels)} {value:.9g}')
+        return '\n'.join(out) + '\n'
+
+    def write_prometheus(self, path):
+        tmp = path + '.tmp'
+        with open(tmp, 'w') as f:
+            f.write(self.prometheus())
+        os.replace(tmp, path)
+
+# Process-wide tracer used by agent.py; enable it with tracer.enabled = True
+tracer = Tracer()
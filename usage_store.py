@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Incremental Slot Usage Store
+
+Persistent aggregate of allocations.csv kept in a small sidecar file
+(<log>.usage.json): the byte offset already consumed plus per-slot counts
+bucketed by hour and by day. update() only parses the tail written since
+the last run, in CHUNK_BYTES pieces, so regenerating the heatmap no longer
+scales with log size and a first run over a large log stays bounded in memory.
+
+Hourly buckets are kept for `hourly_retention` hours; daily buckets and
+totals are kept forever. If the log shrinks or is replaced (rotation), the
+store is rebuilt from the start of the new file.
+"""
+
+import csv
+import io
+import json
+import os
+import time
+from collections import Counter
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+CHUNK_BYTES = 16 << 20
+
+class UsageStore:
+    def __init__(self, csvfile, store_path=None, hourly_retention=31 * 24):
+        self.csvfile = csvfile
+        self.store_path = store_path or csvfile + '.usage.json'
+        self.hourly_retention = hourly_retention
+        self._reset()
+        self._load()
+
+    def _reset(self):
+        self.offset = 0
+        self.inode = None
+        self.columns = None
+        self.totals = Counter()
+        self.hourly = {}   # slot -> {hour bucket: count}
+        self.daily = {}    # slot -> {day bucket: count}
+
+    def _load(self):
+        try:
+            with open(self.store_path, 'r') as f:
+                state = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        self.offset = state['offset']
+        self.inode = state.get('inode')
+        self.columns = state.get('columns')
+        self.totals = Counter(state['totals'])
+        self.hourly = {s: {int(k): v for k, v in b.items()} for s, b in state['hourly'].items()}
+        self.daily = {s: {int(k): v for k, v in b.items()} for s, b in state['daily'].items()}
+
+    def save(self):
+        state = {
+            'offset': self.offset,
+            'inode': self.inode,
+            'columns': self.columns,
+            'totals': self.totals,
+            'hourly': self.hourly,
+            'daily': self.daily,
+        }
+        tmp = self.store_path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp, self.store_path)
+
+    def update(self, chunk_bytes=CHUNK_BYTES):
+        """Consume rows appended since the last update, reading chunk_bytes at a time
+        so memory stays bounded on a first run over a large log. Returns the number of new rows."""
+        st = os.stat(self.csvfile)
+        if st.st_ino != self.inode or st.st_size < self.offset:
+            self._reset()
+            self.inode = st.st_ino
+        if st.st_size == self.offset:
+            return 0
+
+        rows = 0
+        with open(self.csvfile, 'rb') as f:
+            f.seek(self.offset)
+            carry = b''
+            while True:
+                data = f.read(chunk_bytes)
+                if not data:
+                    break
+                data = carry + data
+                # Only whole lines; a partial line is carried into the next chunk,
+                # and a row still being written at EOF is picked up next time
+                end = data.rfind(b'\n') + 1
+                block, carry = data[:end], data[end:]
+                if block:
+                    rows += self._consume(block)
+                    self.offset += end
+        self._expire()
+        return rows
+
+    def _consume(self, block):
+        """Add the whole CSV lines in `block` to the aggregates. Returns the row count."""
+        reader = csv.reader(io.StringIO(block.decode('utf-8'), newline=''))
+        if self.columns is None:
+            header = next(reader)
+            self.columns = [header.index('timestamp'), header.index('slot_id')]
+        ts_col, slot_col = self.columns
+
+        rows = 0
+        for row in reader:
+            if not row:
+                continue
+            slot = row[slot_col]
+            ts = int(float(row[ts_col]))
+            self.totals[slot] += 1
+            hours = self.hourly.setdefault(slot, {})
+            hours[ts // HOUR] = hours.get(ts // HOUR, 0) + 1
+            days = self.daily.setdefault(slot, {})
+            days[ts // DAY] = days.get(ts // DAY, 0) + 1
+            rows += 1
+        return rows
+
+    def _expire(self, now=None):
+        cutoff = int(now or time.time()) // HOUR - self.hourly_retention
+        for slot, buckets in self.hourly.items():
+            for h in [h for h in buckets if h < cutoff]:
+                del buckets[h]
+
+    def counts(self, window_hours=None, now=None):
+        """Per-slot usage Counter, optionally restricted to the last `window_hours`.
+        Windows within the hourly retention are hour-accurate; longer ones use day buckets.
+        """
+        if window_hours is None:
+            return Counter(self.totals)
+        now = int(now or time.time())
+        since = now - int(window_hours * HOUR)
+        c = Counter()
+        if window_hours <= self.hourly_retention:
+            start = since // HOUR
+            for slot, buckets in self.hourly.items():
+                n = sum(v for h, v in buckets.items() if h >= start)
+                if n:
+                    c[slot] = n
+        else:
+            start = since // DAY
+            for slot, buckets in self.daily.items():
+                n = sum(v for d, v in buckets.items() if d >= start)
+                if n:
+                    c[slot] = n
+        return c
+
+def load_counts_incremental(csvfile, window_hours=None, store_path=None):
+    """Update the sidecar store from the log tail and return slot usage counts."""
+    store = UsageStore(csvfile, store_path)
+    store.update()
+    store.save()
+    return store.counts(window_hours)